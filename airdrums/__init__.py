@@ -0,0 +1,10 @@
+"""Air drums: ESP32 sticks -> serial receiver -> sounds on the laptop.
+
+    synth      generators, kit files, sample cache, recorded samples (numpy only)
+    transport  serial/replay/synthetic byte sources and the hit protocol
+    engine     velocity layers, voice management, mixing, latency tracing, offline render
+    ui         the pygame front ends (laptop, laptop2, tester)
+
+Only the modules that need pygame import it, so synthesis, cache warming,
+offline rendering and the stress test never initialize SDL.
+"""
@@ -0,0 +1,3 @@
+"""Playback: velocity layers and voice management on pygame's mixer, the
+block-based MixEngine, latency tracing and offline rendering. velocity and
+polyphony import pygame; the rest does not."""
@@ -0,0 +1,63 @@
+"""Per-hit latency tracing.
+
+Every hit gets a row in a fixed-size ring buffer with a time.perf_counter()
+stamp for each pipeline stage it passes through. Stages a script doesn't have
+(e.g. the queue in laptop2.py) simply stay empty. Rows are written by
+whichever thread handles that stage; each write is a single array store.
+"""
+import csv
+
+import numpy as np
+
+STAGES = ("arrival", "parsed", "enqueued", "dequeued", "lookup", "played", "rendered")
+_INDEX = {name: i for i, name in enumerate(STAGES)}
+
+
+class LatencyTracer:
+    def __init__(self, size=4096):
+        self.size = size
+        self.times = np.full((size, len(STAGES)), np.nan)
+        self.sids = np.zeros(size, dtype=np.int16)
+        self.intensities = np.zeros(size, dtype=np.int16)
+        self.count = 0
+
+    def new_hit(self, sid, intensity, arrival):
+        """Claims the next row and stamps its arrival; returns the row id."""
+        slot = self.count % self.size
+        self.count += 1
+        self.times[slot] = np.nan
+        self.times[slot, 0] = arrival
+        self.sids[slot] = sid
+        self.intensities[slot] = intensity
+        return slot
+
+    def mark(self, slot, stage, t):
+        self.times[slot, _INDEX[stage]] = t
+
+    def percentiles(self, start="arrival", end="played", q=(50, 95, 99)):
+        """Latency percentiles in ms between two stages over the buffered hits, or None."""
+        n = min(self.count, self.size)
+        d = (self.times[:n, _INDEX[end]] - self.times[:n, _INDEX[start]]) * 1000.0
+        d = d[~np.isnan(d)]
+        if not len(d):
+            return None
+        return np.percentile(d, q)
+
+    def summary(self, end="played"):
+        p = self.percentiles(end=end)
+        if p is None:
+            return f"arrival->{end}: no hits yet"
+        return f"arrival->{end} p50 {p[0]:.1f} / p95 {p[1]:.1f} / p99 {p[2]:.1f} ms"
+
+    def dump_csv(self, path):
+        """Writes the buffered hits oldest first; stage columns are ms after arrival."""
+        n = min(self.count, self.size)
+        order = np.roll(np.arange(n), -(self.count % self.size)) if self.count > self.size else np.arange(n)
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(("sid", "intensity", "arrival_s") + tuple(f"{s}_ms" for s in STAGES[1:]))
+            for i in order:
+                row = self.times[i]
+                rel = ["" if np.isnan(t) else f"{(t - row[0]) * 1000:.3f}" for t in row[1:]]
+                w.writerow([int(self.sids[i]), int(self.intensities[i]), f"{row[0]:.6f}"] + rel)
+        return n
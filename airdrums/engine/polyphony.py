@@ -0,0 +1,136 @@
+import collections
+import threading
+import time
+import weakref
+
+import pygame
+
+# --- POLYPHONY ---
+# pygame starts with 8 channels and Sound.play() silently drops the hit (or
+# cuts a random voice) when they are all busy. VoiceManager owns the channels
+# instead: a configurable total, a reserved set per instrument plus a shared
+# pool, a stealing policy, and choke groups by instrument name.
+
+POLICIES = ("oldest", "quietest")
+
+
+class VoiceManager:
+    """Plays Sounds on managed pygame channels. Safe to call from any thread.
+
+    reserved: {instrument: n} channels only that instrument may use; all other
+    channels form a shared pool every instrument can fall back to.
+    chokes: {instrument: (instruments it cuts, ...)}, e.g. {"CH": ("OH",)}.
+    policy: which voice to steal when an instrument has no free channel,
+    "oldest" or "quietest" (hit gain times the fraction of the sound left).
+    """
+
+    def __init__(self, channels=32, reserved=None, chokes=None, policy="oldest"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown stealing policy: {policy}")
+        reserved = reserved or {}
+        if sum(reserved.values()) > channels:
+            raise ValueError(f"{sum(reserved.values())} reserved channels but only {channels} in total")
+        pygame.mixer.set_num_channels(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.policy = policy
+        self.chokes = chokes or {}
+
+        self.reserved = {}
+        first = 0
+        for name, n in reserved.items():
+            self.reserved[name] = list(range(first, first + n))
+            first += n
+        self.shared = list(range(first, channels))
+        self._pools = {}
+
+        # Per channel: (instrument, start time, gain, length in s) of the last voice started on it
+        self._voices = [None] * channels
+        self._lock = threading.Lock()
+        self.played = collections.Counter()
+        self.stolen = collections.Counter()
+        self.choked = collections.Counter()
+
+    def _pool(self, instrument):
+        pool = self._pools.get(instrument)
+        if pool is None:
+            pool = self.reserved.get(instrument, []) + self.shared or list(range(len(self.channels)))
+            self._pools[instrument] = pool
+        return pool
+
+    def _victim(self, pool, now):
+        # A busy channel without a record was started outside the manager; it goes first
+        untracked = next((i for i in pool if self._voices[i] is None), None)
+        if untracked is not None:
+            return untracked
+        if self.policy == "oldest":
+            return min(pool, key=lambda i: self._voices[i][1])
+
+        def level(i):
+            _, started, gain, length = self._voices[i]
+            return gain * max(0.0, 1.0 - (now - started) / length)
+        return min(pool, key=level)
+
+    def stop(self, instrument):
+        """Cuts every ringing voice of an instrument."""
+        with self._lock:
+            self._stop(instrument)
+
+    def _stop(self, instrument):
+        for i, voice in enumerate(self._voices):
+            if voice and voice[0] == instrument and self.channels[i].get_busy():
+                self.channels[i].stop()
+                self.choked[instrument] += 1
+
+    def play(self, instrument, sound, gain=1.0, volume=1.0):
+        """volume: the channel's own (SampleBank pads); gain only ranks voices for stealing."""
+        now = time.perf_counter()
+        with self._lock:
+            for target in self.chokes.get(instrument, ()):
+                self._stop(target)
+            pool = self._pool(instrument)
+            idx = next((i for i in pool if not self.channels[i].get_busy()), None)
+            if idx is None:
+                idx = self._victim(pool, now)
+                self.stolen[instrument] += 1
+            channel = self.channels[idx]
+            channel.set_volume(volume) # Reset too: the channel may have played a sample pad
+            channel.play(sound)
+            self._voices[idx] = (instrument, now, gain, sound.get_length() or 1e-3)
+            self.played[instrument] += 1
+            return channel
+
+    def active_counts(self):
+        """{instrument: voices currently sounding}"""
+        counts = collections.Counter()
+        for i, voice in enumerate(self._voices):
+            if voice and self.channels[i].get_busy():
+                counts[voice[0]] += 1
+        return counts
+
+    def busy(self):
+        """Channels playing anything, managed or not."""
+        return sum(c.get_busy() for c in self.channels)
+
+    def summary(self):
+        active = self.active_counts()
+        voices = " ".join(f"{name} {active[name]}" for name in sorted(self.played))
+        return f"voices {voices or '-'} | stolen {sum(self.stolen.values())}"
+
+
+_sounds = weakref.WeakSet() # Every Sound made by make_sound() that is still alive
+
+
+def make_sound(samples):
+    """pygame.sndarray.make_sound, registered so live_sounds() can count it."""
+    sound = pygame.sndarray.make_sound(samples)
+    _sounds.add(sound)
+    return sound
+
+
+def live_sounds():
+    """Sounds made by make_sound() that are still referenced; cheap, for the profiler.
+
+    Sounds aren't tracked by the garbage collector, so walking gc.get_objects()
+    was the only other way, and that stalled the frames being measured.
+    """
+    return len(_sounds)
@@ -0,0 +1,178 @@
+"""Long-session profiling: allocations per hit, GC pauses, frame times.
+
+Turned on with AIRDRUMS_PROFILE=<file> in the laptop scripts. Every
+`interval` seconds a block like this is appended to the file:
+
+    --- 21:14:05  +600 s ---
+    hits 812 | allocated per hit p50 0 B / p99 480 B / max 2.1 KiB
+    traced 18.4 MiB (peak 19.0 MiB), +0.1 MiB since last
+    gc gen0 311 / gen1 28 / gen2 2 | pause p50 0.08 ms / p99 1.90 ms / max 14.20 ms
+    frames 36000 | render p50 0.40 ms / p99 2.10 ms / max 9.80 ms
+    sounds 64 | busy channels 2
+    top growth since 21:04:05:
+      airdrums/ui/laptop2.py:104: +12.0 KiB (+30)
+    summary took 85 ms
+
+"allocated per hit" is the change in tracemalloc's traced total between
+hit_begin() and hit_end(). tracemalloc counts every thread, so a frame drawn
+at the same moment can show up in it; a steady non-zero p50 is the hot path
+itself. GC pauses come from gc.callbacks, the growth list from diffing
+per-line tracemalloc totals. Grouping a snapshot per line takes 100-200 ms
+of the writer thread and stalls frames while it does, so the growth list
+is only made once the traced total has grown GROWTH_MIN since the last one
+(and in the final summary); a flat session never pays for it. The gauges
+(see gauge()) run on the writer thread too, which is why the summary's own
+time is printed.
+"""
+import gc
+import heapq
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+TRACE_FRAMES = 1 # Stack depth tracemalloc keeps per allocation: more = slower, but deeper growth sites
+TOP_GROWTH = 10  # Lines listed under "top growth"
+GROWTH_MIN = 256 * 1024 # Traced bytes gained before a summary lists growth again
+
+
+def _kib(n):
+    return f"{n / 1024:.1f} KiB" if abs(n) >= 1024 else f"{n:.0f} B"
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.2f} ms"
+
+
+_IGNORED = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>")
+
+
+def _by_line():
+    """{traceback: (size, count)} of a fresh snapshot.
+
+    Each summary groups one snapshot and diffs against the last grouping,
+    instead of Snapshot.compare_to() grouping both again. Ignored files are
+    left out after grouping: filter_traces() matches every single trace and
+    took ten times longer than the snapshot, with the GIL held.
+    """
+    return {s.traceback: (s.size, s.count) for s in tracemalloc.take_snapshot().statistics("lineno")
+            if s.traceback[0].filename not in _IGNORED}
+
+
+def _top_growth(lines, previous):
+    """[(frame, size diff, count diff)] of the lines that grew most."""
+    growth = [(tb[0], size - previous.get(tb, (0, 0))[0], count - previous.get(tb, (0, 0))[1])
+              for tb, (size, count) in lines.items()]
+    return heapq.nlargest(TOP_GROWTH, (g for g in growth if g[1] > 0), key=lambda g: g[1])
+
+
+def _spread(values, fmt):
+    if not values:
+        return "none"
+    a = np.asarray(values, dtype=float)
+    p50, p99 = np.percentile(a, (50, 99))
+    return f"p50 {fmt(p50)} / p99 {fmt(p99)} / max {fmt(a.max())}"
+
+
+class SessionProfiler:
+    def __init__(self, path, interval=60.0):
+        self.path = path
+        self.interval = interval
+        self._hit_bytes = []
+        self._gc_pauses = []
+        self._frames = []
+        self._gc_start = None
+        self._gc_counts = [0, 0, 0]
+        self._gauges = {}
+        self._lines = None
+        self._lines_traced = 0
+        self._lines_time = None
+        self._last_traced = 0
+        self._t0 = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        tracemalloc.start(TRACE_FRAMES)
+        gc.callbacks.append(self._on_gc)
+        self._t0 = time.perf_counter()
+        self._lines = _by_line()
+        self._lines_traced = self._last_traced = tracemalloc.get_traced_memory()[0]
+        self._lines_time = time.strftime("%H:%M:%S")
+        with open(self.path, "a") as f:
+            f.write(f"=== profiling started {time.strftime('%Y-%m-%d %H:%M:%S')}, every {self.interval:.0f} s ===\n")
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+        return self
+
+    def gauge(self, name, fn):
+        """fn() is sampled for every summary (e.g. live Sound objects)."""
+        self._gauges[name] = fn
+
+    # --- HOT PATH ---
+
+    def hit_begin(self):
+        return tracemalloc.get_traced_memory()[0]
+
+    def hit_end(self, token):
+        self._hit_bytes.append(tracemalloc.get_traced_memory()[0] - token)
+
+    def frame(self, seconds):
+        self._frames.append(seconds)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self._gc_pauses.append(time.perf_counter() - self._gc_start)
+            self._gc_counts[info["generation"]] += 1
+
+    # --- SUMMARY ---
+
+    def _writer(self):
+        while not self._stop.wait(self.interval):
+            self.write_summary()
+
+    def write_summary(self, final=False):
+        start = time.perf_counter()
+        # Swap the lists out first: the other threads keep appending to fresh ones
+        hits, self._hit_bytes = self._hit_bytes, []
+        pauses, self._gc_pauses = self._gc_pauses, []
+        frames, self._frames = self._frames, []
+        counts, self._gc_counts = self._gc_counts, [0, 0, 0]
+
+        traced, peak = tracemalloc.get_traced_memory()
+        growth, since = None, self._lines_time
+        if final or traced - self._lines_traced >= GROWTH_MIN:
+            by_line = _by_line()
+            growth = _top_growth(by_line, self._lines)
+            self._lines, self._lines_traced, self._lines_time = by_line, traced, time.strftime("%H:%M:%S")
+
+        lines = [f"--- {time.strftime('%H:%M:%S')}  +{start - self._t0:.0f} s ---",
+                 f"hits {len(hits)} | allocated per hit {_spread(hits, _kib)}",
+                 f"traced {traced / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB), "
+                 f"{(traced - self._last_traced) / 2**20:+.1f} MiB since last",
+                 f"gc gen0 {counts[0]} / gen1 {counts[1]} / gen2 {counts[2]} | pause {_spread(pauses, _ms)}",
+                 f"frames {len(frames)} | render {_spread(frames, _ms)}"]
+        self._last_traced = traced
+        if self._gauges:
+            lines.append(" | ".join(f"{name} {fn()}" for name, fn in self._gauges.items()))
+        if growth is None:
+            lines.append(f"top growth: skipped, {(traced - self._lines_traced) / 2**20:+.2f} MiB since {since}")
+        else:
+            lines.append(f"top growth since {since}:")
+            for frame, size, count in growth:
+                lines.append(f"  {frame.filename}:{frame.lineno}: +{_kib(size)} ({count:+})")
+        lines.append(f"summary took {(time.perf_counter() - start) * 1000:.0f} ms")
+        with open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def stop(self):
+        """Ends the writer thread, writes a final summary, then turns tracing off."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.write_summary(final=True)
+        gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
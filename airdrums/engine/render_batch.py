@@ -0,0 +1,157 @@
+"""Renders every hit log in a directory with every kit, across processes.
+
+    python -m airdrums.engine.render_batch sessions/ renders/ --kits laptop laptop2 open_hats.json
+
+writes renders/<log>__<kit>.wav for each pair. The kits are synthesized once
+in this process and packed into one shared memory block; the workers map it
+read-only instead of each synthesizing (or unpickling) its own copy. Each
+render is mixed and written in --chunk second blocks (render_offline's
+mix_chunks), so a worker's memory doesn't grow with the session length.
+"""
+import argparse
+import collections
+import functools
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..synth import SAMPLE_RATE
+from ..synth import kit as kits
+from ..synth.kit_builder import pool_context
+from .mix_engine import prepare
+from .render_offline import load_hit_log, mix_chunks, schedule, write_wav_chunks
+
+# Where a kit's voices are in the shared bank: voices = {(mode, id): (group, offset, length)}
+KitTable = collections.namedtuple("KitTable", "name modeless chokes exponent floor voices")
+
+_bank = None # Worker side: float32 view of the shared block
+_shm = None
+
+
+def pack_kits(names, report=print):
+    """Synthesizes the kits into one SharedMemory block -> (block, {name: KitTable}).
+
+    The caller closes and unlinks the block when the renders are done.
+    """
+    arrays, tables, size = [], {}, 0
+    for name in names:
+        spec = kits.Kit(name, prepare=lambda takes: prepare(takes[0]))
+        placed, voices = {}, {}
+        for mode in spec.modes:
+            spec.synthesize(mode, workers=None, report=None)
+            loaded = spec.load(mode)
+            for pad, data in loaded.items():
+                if pad not in placed: # Mode-less pads are in every mode, store them once
+                    placed[pad] = (size, len(data))
+                    arrays.append(data)
+                    size += len(data)
+            for sid in {pad.sid for pad in loaded}:
+                pad = spec.pad(mode, sid)
+                voices[(mode, sid)] = (pad.group,) + placed[pad]
+        tables[name] = KitTable(name, spec.modes == [None], spec.chokes, spec.exponent, spec.floor, voices)
+        report(f"{name}: {len(placed)} voices")
+
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1) * 4)
+    bank = np.ndarray(size, dtype=np.float32, buffer=block.buf)
+    pos = 0
+    for data in arrays:
+        bank[pos:pos + len(data)] = data
+        pos += len(data)
+    report(f"Shared bank: {size * 4 / 2**20:.1f} MiB for {len(names)} kits")
+    return block, tables
+
+
+def _attach(name, size):
+    global _shm, _bank
+    _shm = shared_memory.SharedMemory(name=name)
+    _bank = np.ndarray(size, dtype=np.float32, buffer=_shm.buf)
+    _bank.flags.writeable = False
+
+
+def _lookup(table):
+    def lookup(mode, sid):
+        voice = table.voices.get((None if table.modeless else mode, sid))
+        if voice is None:
+            return None, None
+        group, offset, length = voice
+        return group, _bank[offset:offset + length]
+    return lookup
+
+
+def render_one(log, table, out, chunk):
+    """One log with one kit into a WAV -> (hits, samples, seconds taken, pid)."""
+    start = time.perf_counter()
+    times, ids, intensities, modes = load_hit_log(log)
+    gain = functools.partial(kits.velocity_gain, exponent=table.exponent, floor=table.floor)
+    hits = schedule(times, ids, intensities, modes, _lookup(table), table.chokes, gain)
+    samples = write_wav_chunks(out, mix_chunks(*hits, chunk=chunk))
+    return len(times), samples, time.perf_counter() - start, os.getpid()
+
+
+def render_all(logs, kit_names, out_dir, workers=None, chunk=SAMPLE_RATE * 10, report=print):
+    """Renders every (log, kit) pair; returns {(log, kit): wav path}."""
+    os.makedirs(out_dir, exist_ok=True)
+    block, tables = pack_kits(kit_names, report)
+    size = block.size // 4
+    jobs = {}
+    for log in logs:
+        for name in kit_names:
+            stem = os.path.splitext(os.path.basename(name))[0]
+            jobs[(log, name)] = os.path.join(out_dir, f"{os.path.splitext(os.path.basename(log))[0]}__{stem}.wav")
+
+    start = time.perf_counter()
+    audio = 0
+    try:
+        workers = min(len(jobs), workers or os.cpu_count() or 1)
+        if workers > 1:
+            pool = ProcessPoolExecutor(workers, mp_context=pool_context(), initializer=_attach, initargs=(block.name, size))
+            with pool:
+                futures = {pool.submit(render_one, log, tables[name], out, chunk): (log, name)
+                           for (log, name), out in jobs.items()}
+                done = ((futures[f], f.result()) for f in as_completed(futures))
+                for (log, name), result in done:
+                    audio += _report(report, log, name, result)
+        else:
+            _attach(block.name, size)
+            for (log, name), out in jobs.items():
+                audio += _report(report, log, name, render_one(log, tables[name], out, chunk))
+    finally:
+        block.close()
+        block.unlink()
+    took = time.perf_counter() - start
+    report(f"{len(jobs)} renders, {audio:.0f} s of audio in {took:.2f} s "
+           f"({audio / max(took, 1e-9):.0f}x real time, {workers} workers)")
+    return jobs
+
+
+def _report(report, log, name, result):
+    hits, samples, took, pid = result
+    seconds = samples / SAMPLE_RATE
+    report(f"  {os.path.basename(log)} x {name}: {hits} hits, {seconds:.1f} s in {took:.2f} s [pid {pid}]")
+    return seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a directory of hit logs with several kits.")
+    parser.add_argument("logs", help="directory of hit log CSVs (or one CSV)")
+    parser.add_argument("out", help="directory for the WAVs")
+    parser.add_argument("--kits", nargs="+", default=None, help=f"kit names or files (default: {' '.join(kits.available())})")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk", type=float, default=10.0, help="seconds mixed and written at a time")
+    args = parser.parse_args(argv)
+
+    logs = sorted(glob.glob(os.path.join(args.logs, "*.csv"))) if os.path.isdir(args.logs) else [args.logs]
+    if not logs:
+        print(f"No .csv hit logs in {args.logs}")
+        return 1
+    render_all(logs, args.kits or kits.available(), args.out, args.jobs, int(args.chunk * SAMPLE_RATE))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Headless rendering: turn a timestamped hit log into a WAV file.
+
+No pygame window or audio device is needed, so this runs in CI or on a server:
+
+    python -m airdrums.engine.render_offline hits.csv out.wav --kit laptop
+
+The hit log is a CSV with a header and the columns time (seconds), id,
+intensity and optionally mode (defaults to 0). --kit names a kit file (see
+kit.py), so sounds, velocity curve and choke groups match the live scripts.
+Many logs times many kits: render_batch.py.
+"""
+import argparse
+import csv
+import sys
+import time
+import wave
+
+import numpy as np
+
+from ..synth import kit as kits
+from .mix_engine import prepare
+from ..synth import SAMPLE_RATE
+
+
+def load_hit_log(path):
+    """CSV -> (times, ids, intensities, modes) arrays sorted by time."""
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    times = np.array([float(r["time"]) for r in rows])
+    ids = np.array([int(r["id"]) for r in rows], dtype=np.int64)
+    intensities = np.array([int(r["intensity"]) for r in rows], dtype=np.int64)
+    modes = np.array([int(r.get("mode") or 0) for r in rows], dtype=np.int64)
+    order = np.argsort(times, kind="stable")
+    return times[order], ids[order], intensities[order], modes[order]
+
+
+def schedule(times, ids, intensities, modes, lookup, chokes, gain):
+    """Where each hit's voice starts and ends in the output, in samples.
+
+    lookup(mode, id) -> (group, float32 data) or (None, None); chokes and gain
+    as on a Kit. Returns (starts, ends, voices, gains), one entry per hit.
+    """
+    keys = list(zip(modes.tolist(), ids.tolist()))
+    table = {key: lookup(*key) for key in set(keys)} # Resolve each (mode, id) once, not per hit
+    groups = [table[k][0] for k in keys]
+    voices = [table[k][1] for k in keys]
+    gains = [gain(i) for i in intensities.tolist()]
+
+    starts = np.round(times * SAMPLE_RATE).astype(np.int64)
+    starts -= starts.min() if len(starts) else 0
+    ends = np.array([starts[n] + len(v) if v is not None else starts[n] for n, v in enumerate(voices)],
+                    dtype=np.int64)
+
+    # CHOKES: a ringing voice stops at the next hit of a group that chokes it
+    for choker, cut in chokes.items():
+        choke_starts = starts[[g == choker for g in groups]]
+        targets = np.flatnonzero([g in cut for g in groups])
+        if len(choke_starts) and len(targets):
+            nxt = np.searchsorted(choke_starts, starts[targets], side="right")
+            has_next = nxt < len(choke_starts)
+            cut_at = choke_starts[np.minimum(nxt, len(choke_starts) - 1)]
+            ends[targets] = np.where(has_next, np.minimum(ends[targets], cut_at), ends[targets])
+    return starts, ends, voices, gains
+
+
+def mix_into(block, c0, starts, ends, voices, gains, longest):
+    """Adds every hit that sounds inside block (output samples c0 onwards) to it."""
+    c1 = c0 + len(block)
+    # Only hits that start before the block ends and may still ring into it
+    lo, hi = np.searchsorted(starts, (c0 - longest, c1)).tolist()
+    first, last = starts[lo:hi].tolist(), ends[lo:hi].tolist() # Python ints index faster
+    for data, gain, start, end in zip(voices[lo:hi], gains[lo:hi], first, last):
+        s, e = max(start, c0), min(end, c1)
+        if data is None or e <= s:
+            continue
+        block[s - c0:e - c0] += data[s - start:e - start] * gain
+    return block
+
+
+def mix_chunks(starts, ends, voices, gains, chunk=SAMPLE_RATE * 10):
+    """Yields the mix as float32 blocks of `chunk` samples; memory stays at one block.
+
+    starts must be ascending (load_hit_log sorts by time).
+    """
+    total = int(ends.max()) if len(ends) else 0
+    longest = max((len(v) for v in voices if v is not None), default=0)
+    for c0 in range(0, total, chunk):
+        yield mix_into(np.zeros(min(chunk, total - c0), dtype=np.float32), c0, starts, ends, voices, gains, longest)
+
+
+def kit_lookup(spec):
+    """lookup() for schedule() from a Kit prepared with mix_engine.prepare."""
+    def lookup(mode, sid):
+        voice = spec.voice(mode, sid)
+        return (voice[0].group, voice[1]) if voice else (None, None)
+    return lookup
+
+
+def render(times, ids, intensities, modes, kit="laptop"):
+    """Mixes the hits into a float32 buffer in [-1, 1] (not yet clipped)."""
+    spec = kits.Kit(kit, prepare=lambda takes: prepare(takes[0]))
+    starts, ends, voices, gains = schedule(times, ids, intensities, modes, kit_lookup(spec), spec.chokes, spec.gain)
+    out = np.zeros(int(ends.max()) if len(ends) else 0, dtype=np.float32)
+    return mix_into(out, 0, starts, ends, voices, gains, len(out))
+
+
+def write_wav(path, mix, chunk=SAMPLE_RATE * 10):
+    """Clips to int16 and writes in chunks, so no second full-size buffer is made."""
+    write_wav_chunks(path, (mix[i:i + chunk] for i in range(0, len(mix), chunk)))
+
+
+def write_wav_chunks(path, blocks):
+    """Writes float blocks (e.g. from mix_chunks) as 16-bit mono; returns the sample count."""
+    n = 0
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        for block in blocks:
+            w.writeframes((np.clip(block, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+            n += len(block)
+    return n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a hit log to WAV without a display.")
+    parser.add_argument("hits", help="CSV with time,id,intensity[,mode]")
+    parser.add_argument("out", help="output .wav")
+    parser.add_argument("--kit", default="laptop", help=f"kit file or name ({', '.join(kits.available())})")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    hits = load_hit_log(args.hits)
+    mix = render(*hits, kit=args.kit)
+    write_wav(args.out, mix)
+    took = time.perf_counter() - start
+    length = len(mix) / SAMPLE_RATE
+    print(f"{len(hits[0])} hits, {length:.1f} s of audio in {took:.2f} s ({length / max(took, 1e-9):.0f}x real time)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
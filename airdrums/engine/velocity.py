@@ -0,0 +1,95 @@
+import itertools
+
+import numpy as np
+
+from .polyphony import make_sound
+
+# --- VELOCITY LAYERS ---
+# Scaling the sample and calling make_sound on every hit allocates a float64
+# temporary plus a new Sound right on the latency-critical path. Instead every
+# intensity the sticks can send (50-255, see stick_2.ino) is quantized to one
+# of N layers that are rendered once at load time; a hit is then a lookup.
+
+MIN_INTENSITY, MAX_INTENSITY = 50, 255
+
+
+def linear_gain(intensity):
+    return intensity / 255.0
+
+
+class VelocityBank:
+    """Pre-rendered pygame Sounds for one instrument.
+
+    variants: one or more int16 arrays of the same instrument (e.g. different
+    seeds), cycled round-robin within a layer so repeated hits don't sound
+    machine-gunned. gain: maps a stick intensity to a linear amplitude.
+    Needs the pygame mixer to be initialized.
+    """
+
+    def __init__(self, variants, gain=linear_gain, layers=16, preview_len=1000):
+        self.gain = gain
+        self.layers = layers
+        span = MAX_INTENSITY - MIN_INTENSITY
+        # Intensity at the centre of each layer decides its gain
+        centres = MIN_INTENSITY + span * np.arange(layers) / max(layers - 1, 1)
+        self.layer_gains = [gain(c) for c in centres]
+
+        self.sounds = []
+        self.previews = []
+        for g in self.layer_gains:
+            scaled = [(np.asarray(v, dtype=np.float32) * g).astype(np.int16) for v in variants]
+            self.sounds.append([make_sound(s) for s in scaled])
+            self.previews.append(scaled[0][:preview_len])
+        self._next = [itertools.cycle(range(len(variants))) for _ in range(layers)]
+
+    def layer_for(self, intensity):
+        intensity = min(max(intensity, MIN_INTENSITY), MAX_INTENSITY)
+        return round((intensity - MIN_INTENSITY) * (self.layers - 1) / (MAX_INTENSITY - MIN_INTENSITY))
+
+    def get(self, intensity):
+        """(Sound, waveform preview) for a hit of this intensity."""
+        layer = self.layer_for(intensity)
+        return self.sounds[layer][next(self._next[layer])], self.previews[layer]
+
+    def volume(self, intensity):
+        """Channel volume for the hit: 1, the gain is baked into the layers."""
+        return 1.0
+
+
+class SampleBank:
+    """Recorded takes as one Sound each, played at the hit's channel volume.
+
+    A sample library can be hundreds of MB; VelocityBank's scaled copies
+    would cost `layers` times that in RAM. takes.tops (samples.SampleTakes):
+    the highest intensity each take plays, so recorded velocity layers are
+    picked by intensity and takes with the same top round-robin.
+    """
+
+    def __init__(self, takes, gain=linear_gain, preview_len=1000):
+        self.gain = gain
+        self.sounds = [make_sound(np.ascontiguousarray(t)) for t in takes]
+        self.previews = [np.array(t[:preview_len]) for t in takes]
+        tops = sorted(set(takes.tops))
+        self.layers = len(tops)
+        self._members = [[i for i, top in enumerate(takes.tops) if top == t] for t in tops]
+        self._next = [itertools.cycle(m) for m in self._members]
+        # Intensity -> layer, one list lookup per hit
+        self._layer = [next(k for k, t in enumerate(tops) if i <= t) for i in range(MAX_INTENSITY + 1)]
+
+    def layer_for(self, intensity):
+        return self._layer[min(max(intensity, 0), MAX_INTENSITY)]
+
+    def get(self, intensity):
+        """(Sound, waveform preview) for a hit of this intensity."""
+        take = next(self._next[self.layer_for(intensity)])
+        return self.sounds[take], self.previews[take]
+
+    def volume(self, intensity):
+        return self.gain(intensity)
+
+
+def make_bank(takes, gain=linear_gain, layers=16):
+    """SampleBank for a recorded pad's takes, VelocityBank for synthesized ones."""
+    if hasattr(takes, "tops"):
+        return SampleBank(takes, gain)
+    return VelocityBank(takes, gain=gain, layers=layers)
@@ -0,0 +1,3 @@
+"""Sound sources: procedural generators (generators.py), the kits that map
+sticks to them (kit.py), and how their samples are built and cached."""
+from .generators import SAMPLE_RATE, VOICES
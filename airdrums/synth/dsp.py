@@ -0,0 +1,82 @@
+import numpy as np
+
+# scipy is optional and slow to import; only the recursive filters need it,
+# so it is looked up on first use rather than at import time.
+_scipy_lfilter = None
+_scipy_checked = False
+
+# --- DSP PRIMITIVES ---
+# Whole-array replacements for the per-sample filter loops in the generators.
+# All filters start from silence (the sample before x[0] is taken as 0).
+
+
+def first_difference(x):
+    """y[n] = x[n] - x[n-1]. Crude high-pass used for the snare wires."""
+    return pre_emphasis(x, 1.0)
+
+
+def pre_emphasis(x, coeff):
+    """y[n] = x[n] - coeff * x[n-1]. Boosts highs; coeff close to 1 removes the body."""
+    x = np.asarray(x, dtype=np.float32)
+    y = np.empty_like(x)
+    y[:1] = x[:1]
+    y[1:] = x[1:] - coeff * x[:-1]
+    return y
+
+
+def lfilter(b, a, x):
+    """Direct-form IIR/FIR filter, same convention as scipy.signal.lfilter."""
+    global _scipy_lfilter, _scipy_checked
+    if not _scipy_checked:
+        _scipy_checked = True
+        try:
+            from scipy.signal import lfilter as _scipy_lfilter
+        except ImportError:
+            pass
+    x = np.asarray(x, dtype=np.float32)
+    if _scipy_lfilter is not None:
+        return _scipy_lfilter(b, a, x).astype(np.float32)
+
+    # Fallback without scipy: FIR part by slicing, feedback part sample by sample
+    b = np.asarray(b, dtype=np.float64) / a[0]
+    a = np.asarray(a, dtype=np.float64) / a[0]
+    ff = np.zeros(len(x))
+    for k, bk in enumerate(b):
+        ff[k:] += bk * x[:len(x) - k]
+    if len(a) == 1:
+        return ff.astype(np.float32)
+    y = np.zeros(len(x))
+    fb = a[1:]
+    for n in range(len(x)):
+        acc = ff[n]
+        for k in range(min(n, len(fb))):
+            acc -= fb[k] * y[n - 1 - k]
+        y[n] = acc
+    return y.astype(np.float32)
+
+
+def one_pole_lowpass(x, alpha):
+    """y[n] = alpha * x[n] + (1 - alpha) * y[n-1]. Smaller alpha = darker."""
+    return lfilter([alpha], [1.0, alpha - 1.0], x)
+
+
+def one_pole_highpass(x, coeff):
+    """y[n] = coeff * (y[n-1] + x[n] - x[n-1]). RC-style high-pass, coeff in (0, 1)."""
+    return lfilter([coeff, -coeff], [1.0, -coeff], x)
+
+
+def biquad(x, b, a):
+    """Second order section; b and a are the 3-tap numerator/denominator."""
+    return lfilter(b, a, x)
+
+
+def moving_average(x, width):
+    """Box filter, equivalent to np.convolve(x, np.ones(width)/width, mode='same') in O(n)."""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    csum = np.concatenate(([0.0], np.cumsum(x)))
+    # Window sums of the 'full' convolution, then the centred 'same' slice of it
+    k = np.arange(n) + (width - 1) // 2
+    hi = np.minimum(k, n - 1) + 1
+    lo = np.maximum(k - width + 1, 0)
+    return ((csum[hi] - csum[lo]) / width).astype(np.float32)
@@ -0,0 +1,202 @@
+import numpy as np
+
+from .karplus import karplus_strong, inverting_comb
+from .dsp import first_difference, pre_emphasis, moving_average
+
+# --- CONFIGURATION ---
+SAMPLE_RATE = 44100
+
+# --- HIGH QUALITY SOUND GENERATORS ---
+# Shared by laptop.py, laptop2.py and tester.py. Importing this module must
+# stay free of pygame/serial so the sample cache and tools can use it headless.
+
+def generate_punchy_snare():
+    """Synthesizes a high-impact Snare with a 'Pop' transient and high-pass noise."""
+    n_samples = 20000
+    t = np.linspace(0, n_samples / SAMPLE_RATE, n_samples)
+    
+    # 1. THE "POP" (Shell fundamental)
+    freq_env = 180 + 220 * np.exp(-150 * t) 
+    phase = 2 * np.pi * np.cumsum(freq_env) / SAMPLE_RATE
+    pop = np.sin(phase) * np.exp(-30 * t) 
+
+    # 2. THE "SNAP" (Initial stick contact)
+    snap = np.random.uniform(-1, 1, n_samples) * np.exp(-800 * t)
+
+    # 3. THE "SIZZLE" (Snare Wires via High-Pass Filter)
+    noise = np.random.uniform(-1, 1, n_samples)
+    wire_envelope = np.exp(-15 * t)
+    sizzle = first_difference(noise) * wire_envelope
+
+    # Mix: 40% Shell, 20% Snap, 40% Wires
+    combined = (pop * 0.4) + (snap * 0.2) + (sizzle * 0.4)
+    combined = np.tanh(combined * 1.5) # Soft saturation
+    
+    # Normalize
+    max_val = np.max(np.abs(combined))
+    if max_val == 0: return np.zeros(n_samples, dtype=np.int16)
+    return (combined / max_val * 32767 * 0.9).astype(np.int16)
+
+def generate_pro_kick(taper=0.0, level=0.95, decay=0.995):
+    """Deep membrane thump for the Kick drum.
+
+    taper fades the excitation towards its end (laptop2/tester use 0.3 for a
+    rounder attack), level is the peak as a fraction of full scale, decay the
+    Karplus-Strong feedback (closer to 1 = longer boom).
+    """
+    length = 20000
+    wavetable = np.random.uniform(-1, 1, 150).astype(np.float32)
+    wavetable *= 1.0 - np.arange(150) / 150 * taper
+    raw = karplus_strong(wavetable, length, decay, random_sign=True)
+    
+    final = moving_average(raw, 120) # Heavy LPF
+    
+    max_val = np.max(np.abs(final))
+    if max_val == 0: return np.zeros(length, dtype=np.int16)
+    return (final / max_val * 32767 * level).astype(np.int16)
+
+def generate_pro_closed_hat(pitch=1.0, decay=400.0):
+    """Acoustic Closed Hat - Tight metallic 'tick'
+
+    pitch scales the metallic cluster, decay is the rate of the main envelope.
+    """
+    duration = 0.08
+    n_samples = int(SAMPLE_RATE * duration)
+    t = np.linspace(0, duration, n_samples)
+    
+    # Metallic Cluster (9-11 kHz)
+    metallic_freqs = [(9400, 0.35), (9700, 0.40), (10100, 0.50), (10400, 0.45), (10700, 0.38), (11200, 0.25)]
+    metal = np.zeros(n_samples, dtype=np.float32)
+    for freq, amp in metallic_freqs:
+        detune = 1.0 + np.random.uniform(-0.002, 0.002)
+        phase = np.random.uniform(0, 2 * np.pi)
+        metal += amp * np.sin(2 * np.pi * freq * pitch * detune * t + phase)
+    
+    # Filtered Noise
+    noise = np.random.uniform(-1, 1, n_samples).astype(np.float32)
+    hp_noise = pre_emphasis(noise, 0.75)
+    
+    # Transient Click
+    click_len = 80
+    click = np.zeros(n_samples)
+    click_env = np.exp(-np.linspace(0, 10, click_len))
+    click[:click_len] = np.random.uniform(-1, 1, click_len) * click_env
+    
+    # Envelope
+    envelope = np.exp(-decay * t) * 0.85 + np.exp(-60 * t) * 0.15
+    
+    # Mix
+    combined = (metal * 0.50 + hp_noise * 0.25 + click * 0.40) * envelope
+    
+    # High Pass Clean & Saturation
+    hp = np.tanh(pre_emphasis(combined, 0.985) * 1.4)
+    
+    max_val = np.max(np.abs(hp))
+    if max_val == 0: return np.zeros(n_samples, dtype=np.int16)
+    return (hp / max_val * 32767 * 0.8).astype(np.int16)
+
+def generate_pro_open_hat():
+    """Shimmering 'Dhus' metallic wash."""
+    duration = 0.6 # Slightly shorter for better feel
+    n_samples = int(SAMPLE_RATE * duration)
+    t = np.linspace(0, duration, n_samples)
+    buffer_lengths = [31, 47, 61, 89, 113]
+    combined = np.zeros(n_samples, dtype=np.float32)
+    for b_len in buffer_lengths:
+        layer = inverting_comb(np.random.uniform(-1, 1, b_len), n_samples, 0.996)
+        combined += layer * 0.2
+    
+    shimmer = 1.0 + 0.2 * np.sin(2 * np.pi * 10 * t)
+    out = pre_emphasis(combined, 0.9) * np.exp(-6 * t) * shimmer
+        
+    max_val = np.max(np.abs(out))
+    if max_val == 0: return np.zeros(n_samples, dtype=np.int16)
+    return (out / max_val * 32767 * 0.8).astype(np.int16)
+
+def generate_hybrid_snare(decay=0.990):
+    """
+    NEW: Mixes a 'Shell' tone with 'Wire' noise for a realistic Snare.
+    This creates that 'Thwack' sound instead of just a 'boing'.
+    decay is the shell's Karplus-Strong feedback.
+    """
+    n_samples = 20000 # ~0.5 seconds
+    
+    # LAYER 1: The Drum Shell (Tonal Body)
+    # Uses a longer wavetable for a deeper pitch (approx 200Hz)
+    wavetable_size = 250 
+    wavetable = np.random.uniform(-1, 1, wavetable_size).astype(np.float32)
+    # Averaging delay line = low pass filter for the thud, moderate decay
+    shell_sound = karplus_strong(wavetable, n_samples, decay)
+
+    # LAYER 2: The Snares (White Noise Burst)
+    noise = np.random.uniform(-1, 1, n_samples).astype(np.float32)
+    # Fast exponential decay envelope for the "Snap"
+    envelope = np.exp(-np.linspace(0, 40, n_samples)) 
+    wires_sound = noise * envelope
+
+    # MIXING: Blend 50% Shell + 50% Wires
+    combined = (shell_sound * 0.5) + (wires_sound * 0.5)
+
+    # FINAL POLISH: Boost Highs for crispness
+    # Simple difference filter
+    final_sound = pre_emphasis(combined, 0.5)
+
+    # Normalize
+    final_sound = final_sound / (np.max(np.abs(final_sound)) + 1e-6)
+    return (final_sound * 32767).astype(np.int16)
+
+def generate_tad_dhus_cymbal(is_open=False):
+    """Synthesizes 'Tad-Dhus' Cymbal (Attack + Ring)"""
+    duration = 0.6 if is_open else 0.35 
+    n_samples = int(SAMPLE_RATE * duration)
+    
+    # Cluster Frequencies: Highs (31,37,41) + Body/Dhus (83,97)
+    buffer_lengths = [31, 37, 41, 83, 97] 
+    weights = [0.3, 0.2, 0.3, 0.15, 0.15]
+    
+    combined_sound = np.zeros(n_samples, dtype=np.float32)
+
+    for i, buf_len in enumerate(buffer_lengths):
+        wavetable = np.random.uniform(-1, 1, buf_len).astype(np.float32)
+        
+        if is_open:
+            decay = 0.992 if buf_len > 50 else 0.980 
+        else:
+            decay = 0.95
+
+        layer = inverting_comb(wavetable, n_samples, decay) # High-Pass Feedback
+        combined_sound += layer * weights[i]
+
+    # Filter: Allow some body (0.6 coeff) for the "Dhus" sound
+    final_sound = pre_emphasis(combined_sound, 0.6)
+
+    if not is_open: final_sound *= 1.5 # Boost closed hat
+    
+    final_sound = final_sound / (np.max(np.abs(final_sound)) + 1e-6)
+    return (final_sound * 32767).astype(np.int16)
+
+def generate_pro_snare():
+    """Crisp Snare"""
+    length = 20000
+    wavetable = np.random.uniform(-1, 1, 150).astype(np.float32)
+    wavetable *= 1.0 - np.arange(150) / 150 * 0.3
+    
+    raw = karplus_strong(wavetable, length, 0.99, random_sign=True)
+        
+    final = moving_average(raw, 12) # Light LPF
+    return (final/np.max(np.abs(final)) * 32767).astype(np.int16)
+
+# --- VOICES ---
+# Every sound the entry points use, by name: (generator, keyword arguments).
+# The sample cache warms exactly this list.
+VOICES = {
+    "punchy_snare": (generate_punchy_snare, {}),
+    "pro_kick": (generate_pro_kick, {}),
+    "pro_closed_hat": (generate_pro_closed_hat, {}),
+    "pro_open_hat": (generate_pro_open_hat, {}),
+    "hybrid_snare": (generate_hybrid_snare, {}),
+    "deep_kick": (generate_pro_kick, {"taper": 0.3, "level": 1.0}),
+    "pro_snare": (generate_pro_snare, {}),
+    "closed_cymbal": (generate_tad_dhus_cymbal, {"is_open": False}),
+    "open_cymbal": (generate_tad_dhus_cymbal, {"is_open": True}),
+}
@@ -0,0 +1,48 @@
+import numpy as np
+
+# --- KARPLUS-STRONG / COMB FILTER ENGINE ---
+# The generators used to run the delay line one sample at a time with
+# list.pop(0)/append, which is O(buffer_len) per step. Both recurrences below
+# only look back a full period, so a whole period can be computed at once.
+
+
+def karplus_strong(wavetable, n_samples, decay, random_sign=False):
+    """Averaging Karplus-Strong delay line.
+
+    Output starts with the wavetable, then y[n] = decay * 0.5 * (y[n-N] + y[n-N+1])
+    where N is the wavetable length. With random_sign=True every new sample has
+    its sign flipped with probability 0.5 (the 'drum' variant used for kicks).
+    """
+    wavetable = np.asarray(wavetable, dtype=np.float32)
+    period = len(wavetable)
+    if period < 2:
+        raise ValueError("karplus_strong needs a wavetable of at least 2 samples")
+
+    out = np.empty(n_samples, dtype=np.float32)
+    head = min(period, n_samples)
+    out[:head] = wavetable[:head]
+
+    # Per-sample gain, including the random sign flips, drawn in one call
+    gain = np.full(n_samples, 0.5 * decay, dtype=np.float32)
+    if random_sign:
+        gain[np.random.randint(0, 2, n_samples).astype(bool)] *= -1
+
+    for start in range(period, n_samples, period):
+        stop = min(start + period, n_samples)
+        # Everything but the last sample of a full period depends only on the previous period
+        m = min(stop - start, period - 1)
+        prev = out[start - period:start - period + m + 1]
+        out[start:start + m] = gain[start:start + m] * (prev[:-1] + prev[1:])
+        if stop - start == period:
+            # ...the last one also needs the first sample of this period
+            out[stop - 1] = gain[stop - 1] * (out[start - 1] + out[start])
+    return out
+
+
+def inverting_comb(wavetable, n_samples, decay):
+    """Inverting comb (y[n] = -decay * y[n-N]), the metallic ring used for hats and cymbals."""
+    wavetable = np.asarray(wavetable, dtype=np.float32)
+    period = len(wavetable)
+    n_periods = -(-n_samples // period)
+    period_gain = ((-decay) ** np.arange(n_periods)).astype(np.float32)
+    return np.outer(period_gain, wavetable).ravel()[:n_samples]
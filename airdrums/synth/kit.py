@@ -0,0 +1,232 @@
+"""Declarative drum kits.
+
+A kit file (JSON, or TOML on Python 3.11+) lists pads. Each pad maps a stick
+id, optionally in one mode, to a generator and its parameters:
+
+    {
+      "title": "Air Drums: Pro Engine",
+      "velocity": {"exponent": 0.7, "floor": 0.0},
+      "pads": [
+        {"mode": 1, "id": 2, "voice": "pro_closed_hat", "color": [255, 255, 100],
+         "label": "CH", "group": "CH", "chokes": ["OH"], "channels": 2, "key": "f"}
+      ]
+    }
+
+    voice      a generators.VOICES name, or
+    generator  a synth.generators function name, with "params" as keyword arguments
+               (params also override a voice's defaults), or
+    sample     a WAV/raw PCM file, or a list of them as round-robin takes;
+               paths are relative to the kit file, raw files take a
+               "format": {"rate": 48000, "dtype": "<i2", "channels": 1}
+    layers     recorded velocity layers, softest first, instead of "sample":
+               [{"sample": "soft.wav", "max": 100}, {"sample": ["hard1.wav", "hard2.wav"]}]
+               each plays hits up to its "max" intensity (the last one up to
+               255); a layer with several files round-robins them
+    mode       omitted = the pad plays in every mode
+    group      choke group / voice-manager instrument (defaults to the label)
+    chokes     groups this pad cuts off when it plays
+    channels   mixer channels reserved for the group
+    key        keyboard test binding (pygame key name)
+
+Samples are only synthesized (or loaded from the sample cache) when a mode is
+first used; prefetch() loads the remaining modes on a background thread.
+"""
+import json
+import os
+import threading
+from collections import namedtuple
+
+from . import generators, kit_builder, samples
+
+KIT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kits")
+
+Pad = namedtuple("Pad", "mode sid generator params color label group chokes channels key sample sample_format tops",
+                 defaults=((),))
+
+
+def kit_path(name):
+    """Path of a kit by name (kits/<name>.json or .toml) or as given."""
+    if os.path.exists(name):
+        return name
+    for ext in (".json", ".toml"):
+        path = os.path.join(KIT_DIR, name + ext)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No kit named {name!r} in {KIT_DIR}")
+
+
+def available():
+    if not os.path.isdir(KIT_DIR):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(KIT_DIR) if f.endswith((".json", ".toml")))
+
+
+def _read(path):
+    if path.endswith(".toml"):
+        import tomllib  # Python 3.11+
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+
+def _pad(entry, base):
+    sample, tops = entry.get("sample"), ()
+    if "layers" in entry:
+        sample = []
+        for i, layer in enumerate(entry["layers"]):
+            files = [layer["sample"]] if isinstance(layer["sample"], str) else layer["sample"]
+            sample += files
+            top = 255 if i == len(entry["layers"]) - 1 else layer["max"]
+            tops += (top,) * len(files)
+    if sample is not None:
+        sample = tuple(os.path.join(base, f) for f in ([sample] if isinstance(sample, str) else sample))
+        generator, params = None, {}
+    elif "voice" in entry:
+        fn, params = generators.VOICES[entry["voice"]]
+        generator, params = fn.__name__, dict(params, **entry.get("params", {}))
+    else:
+        generator, params = entry["generator"], dict(entry.get("params", {}))
+        if not callable(getattr(generators, generator, None)):
+            raise ValueError(f"Unknown generator {generator!r}")
+    label = entry.get("label", generator or os.path.splitext(os.path.basename(sample[0]))[0])
+    return Pad(mode=entry.get("mode"), sid=entry.get("id"), generator=generator,
+               params=tuple(sorted(params.items())), # Hashable, pads key the loaded samples
+               color=tuple(entry.get("color", (200, 200, 200))), label=label,
+               group=entry.get("group", label), chokes=tuple(entry.get("chokes", ())),
+               channels=entry.get("channels", 0), key=entry.get("key"),
+               sample=sample, sample_format=tuple(sorted(entry.get("format", {}).items())), tops=tops)
+
+
+def velocity_gain(intensity, exponent=1.0, floor=0.0):
+    """A kit's velocity curve as a plain function, for worker processes."""
+    return max(floor, (intensity / 255.0) ** exponent)
+
+
+class Kit:
+    """Pads from a kit file, with samples loaded per mode on first use.
+
+    prepare: called once per pad with its list of takes (e.g. velocity.make_bank;
+    a recorded pad's list is a samples.SampleTakes); voice() returns its
+    result. Defaults to the takes.
+    """
+
+    def __init__(self, name, variants=1, prepare=None):
+        self.path = kit_path(name)
+        spec = _read(self.path)
+        self.title = spec.get("title", os.path.splitext(os.path.basename(self.path))[0])
+        curve = spec.get("velocity", {})
+        self.exponent = curve.get("exponent", 1.0)
+        self.floor = curve.get("floor", 0.0)
+        base = os.path.dirname(os.path.abspath(self.path))
+        self.pads = [_pad(entry, base) for entry in spec["pads"]]
+        self.variants = variants
+        self.prepare = prepare or (lambda takes: takes)
+
+        self.modes = sorted({p.mode for p in self.pads if p.mode is not None}) or [None]
+        self.chokes = {}
+        self.reserved = {}
+        for p in self.pads:
+            if p.chokes:
+                self.chokes[p.group] = tuple(dict.fromkeys(self.chokes.get(p.group, ()) + p.chokes))
+            if p.channels:
+                self.reserved[p.group] = max(self.reserved.get(p.group, 0), p.channels)
+
+        self._takes = {}
+        self._loaded = {}
+        self._locks = {mode: threading.RLock() for mode in self.modes}
+
+    def gain(self, intensity):
+        """Velocity curve from the kit file: max(floor, (intensity / 255) ** exponent)."""
+        return velocity_gain(intensity, self.exponent, self.floor)
+
+    def _mode_key(self, mode):
+        return None if self.modes == [None] else mode
+
+    def pads_for(self, mode):
+        """Pads that play in a mode: its own plus the mode-less ones."""
+        return [p for p in self.pads if p.mode is None or p.mode == mode]
+
+    def pad(self, mode, sid):
+        key = self._mode_key(mode)
+        if key not in self._locks:
+            return None
+        for p in self.pads_for(key):
+            if p.sid == sid:
+                return p
+        return None
+
+    def synthesize(self, mode=None, workers=1, report=None):
+        """{pad: [takes]} for a mode, synthesized, cached or mapped from disk on first use.
+
+        workers > 1 uses kit_builder's process pool, so only before pygame.init().
+        """
+        key = self._mode_key(mode)
+        if key not in self._locks:
+            return {}
+        with self._locks[key]:
+            if key not in self._takes:
+                pads = [p for p in self.pads_for(key) if p.sample is None]
+                takes = kit_builder.build([(p.generator, dict(p.params)) for p in pads],
+                                          self.variants, workers, report)
+                loaded = dict(zip(pads, takes))
+                # Recorded pads: memory-mapped, each file is one take
+                for p in self.pads_for(key):
+                    if p.sample is not None:
+                        loaded[p] = samples.SampleTakes(
+                            [samples.load_sample(f, **dict(p.sample_format)) for f in p.sample], p.tops)
+                self._takes[key] = {p: loaded[p] for p in self.pads_for(key)}
+        return self._takes[key]
+
+    def load(self, mode=None):
+        """{pad: prepared takes} for a mode. Safe from several threads; a second caller waits."""
+        key = self._mode_key(mode)
+        loaded = self._loaded.get(key)
+        if loaded is not None:
+            return loaded
+        if key not in self._locks:
+            return {}
+        with self._locks[key]:
+            if key not in self._loaded:
+                self._loaded[key] = {p: self.prepare(t) for p, t in self.synthesize(key).items()}
+        return self._loaded[key]
+
+    def swap(self, pad, prepared):
+        """Puts new prepared takes in for a pad in every loaded mode; returns the old ones.
+
+        Each mode's dict is replaced, not changed, so a hit that already
+        looked the pad up plays the old takes and the next one gets these.
+        """
+        old = None
+        for key, lock in self._locks.items():
+            with lock:
+                loaded = self._loaded.get(key)
+                if loaded is not None and pad in loaded:
+                    old = loaded[pad] if old is None else old
+                    loaded = dict(loaded)
+                    loaded[pad] = prepared
+                    self._loaded[key] = loaded
+        return old
+
+    def loaded(self, mode):
+        return self._mode_key(mode) in self._loaded
+
+    def voice(self, mode, sid):
+        """(pad, prepared takes) for a hit, loading its mode if needed, or None."""
+        p = self.pad(mode, sid)
+        if p is None:
+            return None
+        return p, self.load(mode)[p]
+
+    def prefetch(self, modes=None):
+        """Loads the given (default: all) modes on a daemon thread; returns it."""
+        def run():
+            for mode in modes if modes is not None else self.modes:
+                self.load(mode)
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        return t
+
+    def keys(self):
+        """{pygame key name: pad} for the keyboard test bindings."""
+        return {p.key: p for p in self.pads if p.key}
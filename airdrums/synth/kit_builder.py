@@ -0,0 +1,112 @@
+"""Builds a kit's samples in parallel.
+
+Every (voice, round-robin take) pair is an independent, CPU-bound, GIL-bound
+generator call, so cache misses are spread over a ProcessPoolExecutor. Take n
+of a voice always uses seed n, so parallel and serial builds are identical
+(and identical to load_variants()). Workers write the sample cache; the parent
+then memory-maps the results instead of receiving them through a pipe.
+
+    python -m airdrums.synth.kit_builder [--variants N] [--jobs N] [--force] [voice ...]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import generators, sample_cache
+
+
+def _synthesize(generator, params, seed):
+    """Worker: fills the cache for one take; returns (data or None, seconds, pid)."""
+    start = time.perf_counter()
+    data = sample_cache.cached(getattr(generators, generator), seed=seed, **dict(params))
+    took = time.perf_counter() - start
+    # A memory map means the cache has it; only ship the samples if it couldn't be written
+    return (None if hasattr(data, "filename") else data), took, os.getpid()
+
+
+def pool_context():
+    # Fork starts workers fastest; elsewhere spawn works because the entry
+    # points only run main() under a __main__ guard.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+
+def voice_spec(name):
+    """(generator name, params) for a generators.VOICES entry."""
+    fn, params = generators.VOICES[name]
+    return fn.__name__, params
+
+
+def build(specs, variants=1, workers=None, report=print):
+    """[[take 0, take 1, ...] per spec] for (generator name, params) specs.
+
+    Generators are looked up in synth.generators by name so jobs pickle cheaply. Pass
+    workers=1 to stay in-process, e.g. from a thread once pygame is running.
+    report gets one line per generated take plus a total (None = silent).
+    """
+    keys = [(generator, tuple(sorted(params.items()))) for generator, params in specs]
+    jobs = [(key, seed) for key in dict.fromkeys(keys) for seed in range(variants)]
+    missing = [job for job in jobs if not sample_cache.is_cached(getattr(generators, job[0][0]), job[1], **dict(job[0][1]))]
+    results = {}
+    timings = {}
+
+    start = time.perf_counter()
+    ctx = pool_context()
+    workers = min(len(missing), workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {job: pool.submit(_synthesize, *job[0], job[1]) for job in missing}
+            done = {job: future.result() for job, future in futures.items()}
+    else:
+        done = {job: _synthesize(*job[0], job[1]) for job in missing}
+    wall = time.perf_counter() - start
+
+    for job, (data, took, pid) in done.items():
+        timings[job] = (took, pid)
+        if data is not None:
+            results[job] = data
+
+    for job in jobs:
+        if job not in results:
+            (generator, params), seed = job
+            results[job] = sample_cache.cached(getattr(generators, generator), seed=seed, **dict(params))
+
+    if report:
+        for ((generator, params), seed), (took, pid) in sorted(timings.items(), key=lambda kv: -kv[1][0]):
+            args = ", ".join(f"{k}={v}" for k, v in params)
+            report(f"  {generator}({args}) seed {seed}: {took * 1000:.1f} ms (pid {pid})")
+        serial = sum(took for took, _ in timings.values())
+        report(f"Kit: {len(jobs)} takes, {len(missing)} synthesized in {wall * 1000:.1f} ms "
+               f"({serial * 1000:.1f} ms of generator time, {len(jobs) - len(missing)} cached)")
+    return [[results[(key, seed)] for seed in range(variants)] for key in keys]
+
+
+def build_kit(names, variants=1, workers=None, report=print):
+    """{voice name: [take 0, take 1, ...]} for the given generators.VOICES names.
+
+    Call this before pygame.init() so no audio threads exist when forking.
+    """
+    names = list(dict.fromkeys(names))
+    return dict(zip(names, build([voice_spec(n) for n in names], variants, workers, report)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthesize voices in parallel into the sample cache.")
+    parser.add_argument("voices", nargs="*", help="generators.VOICES names (default: all)")
+    parser.add_argument("--variants", type=int, default=1, help="round-robin takes per voice")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="clear the cache first")
+    args = parser.parse_args(argv)
+
+    if args.force:
+        print(f"Removed {sample_cache.clear()} cached samples")
+    build_kit(args.voices or list(generators.VOICES), args.variants, args.jobs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Live sound tweaking: re-synthesize a pad with new parameters while playing.
+
+The arrow keys in the laptop scripts drive it: left/right pick a pad
+parameter, up/down nudge it, backspace puts the pad back to its kit file
+values. What can be tuned is listed in TUNABLE per generator, e.g. the
+kick's Karplus-Strong decay or the closed hat's pitch.
+
+A nudge never synthesizes on the caller's thread. It records the wanted
+parameters and wakes a worker thread, which synthesizes the takes with the
+kit's seeds (the same value is always the same sound) and runs the kit's
+prepare on them (velocity layers, Sounds). Nudges that arrive meanwhile
+overwrite each other, so only the newest parameters of a pad get rendered.
+Kit.swap() then puts the result in: a hit that already looked the pad up
+finishes with the old sound, the next one gets the new one, and sounds
+already ringing play out.
+
+The last `memo` rendered parameter sets are kept, least recently used
+dropped first, so going back to a value swaps straight from the memo.
+Tweaked takes never go into the sample cache.
+"""
+import collections
+import inspect
+import threading
+import time
+
+import numpy as np
+
+from . import generators, sample_cache
+
+# Generator -> {keyword: (step, lowest, highest)}
+TUNABLE = {
+    "generate_pro_kick": {"decay": (0.001, 0.980, 0.999), "taper": (0.1, 0.0, 1.0)},
+    "generate_pro_closed_hat": {"pitch": (0.05, 0.5, 2.0), "decay": (50.0, 100.0, 1500.0)},
+    "generate_hybrid_snare": {"decay": (0.002, 0.950, 0.998)},
+}
+
+
+def _defaults(generator):
+    fn = getattr(generators, generator)
+    return {name: p.default for name, p in inspect.signature(fn).parameters.items()
+            if p.default is not inspect.Parameter.empty}
+
+
+class LiveSynth:
+    def __init__(self, kit, memo=16):
+        self.kit = kit
+        self.memo_size = memo
+        self.controls = [(pad, name) for pad in kit.pads for name in TUNABLE.get(pad.generator, ())]
+        self.selected = 0
+        self.params = {}     # pad -> parameters asked for last
+        self._applied = {}   # pad -> parameters of the takes playing now
+        self._pending = {}   # pad -> parameters waiting for the worker
+        self._memo = collections.OrderedDict() # (pad, params) -> prepared takes
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.busy = False
+        self.render_s = collections.deque(maxlen=64) # Seconds per re-synthesis
+        self.renders = self.memo_hits = self.swaps = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Lets a render in progress finish, then ends the worker (before pygame.quit())."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(2.0)
+
+    def _current(self, pad):
+        """A copy of the pad's parameters as last asked for (the kit file's at first)."""
+        return dict(self.params.get(pad) or dict(_defaults(pad.generator), **dict(pad.params)))
+
+    # --- CONTROLS (window thread) ---
+
+    def key(self, name):
+        """Handles a pygame key name; False if it isn't one of ours."""
+        if not self.controls:
+            return False
+        if name in ("left", "right"):
+            self.selected = (self.selected + (1 if name == "right" else -1)) % len(self.controls)
+        elif name in ("up", "down"):
+            self.nudge(1 if name == "up" else -1)
+        elif name == "backspace":
+            pad = self.controls[self.selected][0]
+            self.set(pad, dict(_defaults(pad.generator), **dict(pad.params)))
+        else:
+            return False
+        return True
+
+    def nudge(self, steps):
+        pad, name = self.controls[self.selected]
+        step, lowest, highest = TUNABLE[pad.generator][name]
+        params = self._current(pad)
+        # Rounded so that stepping back lands on the exact memo key again
+        params[name] = round(min(max(params[name] + steps * step, lowest), highest), 6)
+        self.set(pad, params)
+
+    def set(self, pad, params):
+        """Asks for a pad with these parameters: from the memo now, or from the worker soon."""
+        key = (pad, tuple(sorted(params.items())))
+        with self._cond:
+            self.params[pad] = params
+            prepared = self._memo.get(key)
+            if prepared is None:
+                self._pending[pad] = params
+                self._cond.notify()
+                return
+            self._memo.move_to_end(key)
+            self.memo_hits += 1
+        self._swap(pad, params, prepared)
+
+    # --- WORKER ---
+
+    def _remember(self, key, prepared):
+        with self._cond:
+            self._memo[key] = prepared
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def _swap(self, pad, params, prepared):
+        with self._cond:
+            if self.params.get(pad) != params:
+                return # Asked for something else meanwhile
+            before = self._applied.get(pad) or dict(_defaults(pad.generator), **dict(pad.params))
+            self._applied[pad] = params
+            old = self.kit.swap(pad, prepared)
+            self.swaps += 1
+            # What was playing goes into the memo too, so flipping back is instant
+            key = (pad, tuple(sorted(before.items())))
+            if old is not None and key not in self._memo:
+                self._remember(key, old)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self.busy = False
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                self.busy = True
+                pad, params = self._pending.popitem()
+            start = time.perf_counter()
+            # Loaded first so the mode's own load doesn't put the kit file values back later
+            for mode in self.kit.modes if pad.mode is None else [pad.mode]:
+                self.kit.load(mode)
+            fn = getattr(generators, pad.generator)
+            takes = [sample_cache.seeded(fn, seed=seed, **params) for seed in range(self.kit.variants)]
+            prepared = self.kit.prepare(takes)
+            self.render_s.append(time.perf_counter() - start)
+            self.renders += 1
+            self._remember((pad, tuple(sorted(params.items()))), prepared)
+            self._swap(pad, params, prepared)
+
+    # --- DISPLAY ---
+
+    def status(self):
+        """One HUD line: the selected parameter and what the worker is doing."""
+        if not self.controls:
+            return ""
+        pad, name = self.controls[self.selected]
+        value = self._current(pad)[name]
+        state = "rendering..." if self.busy or self._pending else f"memo {len(self._memo)}/{self.memo_size}"
+        if self.render_s:
+            state += f", last {self.render_s[-1] * 1000:.0f} ms"
+        return f"tweak {pad.label} {name} = {value:g} (arrows, backspace resets) | {state}"
+
+    def summary(self):
+        line = f"{self.renders} renders, {self.memo_hits} from memo, {self.swaps} swaps"
+        if self.render_s:
+            ms = np.array(self.render_s) * 1000
+            line += f" | render p50 {np.percentile(ms, 50):.0f} / max {ms.max():.0f} ms"
+        changed = [f"{pad.label} " + ", ".join(f"{k}={v:g}" for k, v in sorted(p.items())
+                                              if k in TUNABLE[pad.generator])
+                   for pad, p in self._applied.items()
+                   if p != dict(_defaults(pad.generator), **dict(pad.params))]
+        if changed:
+            line += " | " + "; ".join(changed)
+        return line
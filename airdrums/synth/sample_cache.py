@@ -0,0 +1,141 @@
+"""On-disk cache for synthesized drum samples.
+
+Each generator call is keyed on (function name, parameters, SAMPLE_RATE, seed,
+code version) and stored as an int16 .npy file that is memory-mapped on load,
+so a warm start skips synthesis entirely.
+
+    python -m airdrums.synth.sample_cache warm     # synthesize every voice in generators.VOICES
+    python -m airdrums.synth.sample_cache clear    # delete all cached samples
+    python -m airdrums.synth.sample_cache list     # show cached files
+"""
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import generators
+
+CACHE_DIR = os.environ.get("AIRDRUMS_CACHE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "airdrums"))
+CACHE_VERSION = 1 # Bump to invalidate everything by hand
+
+# Changing any of these files changes what the generators produce
+_SOURCE_MODULES = ("generators.py", "karplus.py", "dsp.py")
+_code_version = None
+
+
+def code_version():
+    """Hash of the synthesis sources, computed once per process."""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha1(str(CACHE_VERSION).encode())
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in _SOURCE_MODULES:
+            with open(os.path.join(here, name), "rb") as f:
+                h.update(f.read())
+        _code_version = h.hexdigest()[:12]
+    return _code_version
+
+
+def cache_key(fn, args, kwargs, seed):
+    payload = repr((fn.__name__, args, sorted(kwargs.items()), generators.SAMPLE_RATE, seed, code_version()))
+    return f"{fn.__name__}-{hashlib.sha1(payload.encode()).hexdigest()[:16]}"
+
+
+def cache_path(fn, args, kwargs, seed):
+    return os.path.join(CACHE_DIR, cache_key(fn, args, kwargs, seed) + ".npy")
+
+
+def seeded(fn, *args, seed=0, **kwargs):
+    """fn(*args, **kwargs) as int16 with np.random seeded to `seed`, bypassing the cache."""
+    state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        return np.asarray(fn(*args, **kwargs), dtype=np.int16)
+    finally:
+        np.random.set_state(state)
+
+
+def cached(fn, *args, seed=0, **kwargs):
+    """Returns fn(*args, **kwargs) as a read-only memory-mapped int16 array.
+
+    The generator runs with np.random seeded to `seed` (the global RNG state is
+    restored afterwards), so a cache hit and a miss give the same sound.
+    """
+    path = cache_path(fn, args, kwargs, seed)
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass # Missing or truncated: synthesize below
+
+    data = seeded(fn, *args, seed=seed, **kwargs)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp, path) # Atomic, a crash never leaves a half-written sample
+    except OSError as e:
+        print(f"Sample cache not writable ({e}), continuing without it")
+        return data
+    return np.load(path, mmap_mode="r")
+
+
+def load_voice(name, seed=0):
+    """Cached sample for one entry of generators.VOICES."""
+    fn, params = generators.VOICES[name]
+    return cached(fn, seed=seed, **params)
+
+
+def is_cached(fn, seed=0, **kwargs):
+    return os.path.exists(cache_path(fn, (), kwargs, seed))
+
+
+def load_variants(name, count):
+    """`count` round-robin takes of one voice (seeds 0..count-1)."""
+    return [load_voice(name, seed) for seed in range(count)]
+
+
+def clear():
+    """Deletes every cached sample, returns how many files were removed."""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    removed = 0
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".npy") or name.endswith(".tmp"):
+            os.remove(os.path.join(CACHE_DIR, name))
+            removed += 1
+    return removed
+
+
+def warm(names=None, seed=0):
+    for name in names or generators.VOICES:
+        start = time.perf_counter()
+        data = load_voice(name, seed)
+        print(f"{name:<16}{len(data):>8} samples {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    cmd = argv[0] if argv else "warm"
+    if cmd == "warm":
+        start = time.perf_counter()
+        warm(argv[1:])
+        print(f"Cache warm in {(time.perf_counter() - start) * 1000:.1f} ms ({CACHE_DIR})")
+    elif cmd == "clear":
+        print(f"Removed {clear()} cached samples from {CACHE_DIR}")
+    elif cmd == "list":
+        if os.path.isdir(CACHE_DIR):
+            for name in sorted(os.listdir(CACHE_DIR)):
+                print(f"{name:<40}{os.path.getsize(os.path.join(CACHE_DIR, name)):>10} bytes")
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
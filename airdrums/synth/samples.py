@@ -0,0 +1,145 @@
+"""Recorded one-shots as instruments.
+
+WAV (PCM 8/16/32-bit or 32/64-bit float, any channel count) and headerless
+raw PCM files are memory-mapped, so opening a large library reads nothing but
+the headers. A file that is already 16-bit mono at SAMPLE_RATE is used as is;
+anything else is mixed to mono, resampled and converted once, and the result
+goes into the sample cache (keyed on path, size, mtime and this file's
+source), so later runs memory-map it too. 24-bit PCM always goes through the
+conversion: NumPy has no 3-byte integer to map it as.
+"""
+import hashlib
+import os
+import struct
+from math import gcd
+
+import numpy as np
+
+from . import sample_cache
+from .generators import SAMPLE_RATE
+
+_WAV_FORMATS = {(1, 8): "u1", (1, 16): "<i2", (1, 24): "V3", (1, 32): "<i4", (3, 32): "<f4", (3, 64): "<f8"}
+_RAW_EXTENSIONS = (".raw", ".pcm")
+_version = None
+
+
+class SampleTakes(list):
+    """A sample pad's takes. tops[i]: the highest intensity take i plays (velocity layers)."""
+
+    def __init__(self, takes, tops=None):
+        super().__init__(takes)
+        self.tops = tuple(tops) if tops else (255,) * len(self)
+
+
+def convert_version():
+    """Hash of this file: a change to the conversion invalidates cached conversions."""
+    global _version
+    if _version is None:
+        with open(os.path.abspath(__file__), "rb") as f:
+            _version = hashlib.sha1(f.read()).hexdigest()[:12]
+    return _version
+
+
+def open_wav(path):
+    """(memmap of frames x channels, sample rate) for a WAV file, without reading the data."""
+    with open(path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError(f"{path}: not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path}: no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(size + (size & 1))
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == 0xFFFE: # WAVE_FORMAT_EXTENSIBLE: the real tag starts the sub-format GUID
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR) # Chunks are word aligned
+    if fmt is None:
+        raise ValueError(f"{path}: data before fmt chunk")
+    tag, channels, rate, bits = fmt
+    dtype = _WAV_FORMATS.get((tag, bits))
+    if dtype is None:
+        raise ValueError(f"{path}: unsupported WAV format {tag} with {bits} bits")
+    frames = min(size, os.path.getsize(path) - offset) // (np.dtype(dtype).itemsize * channels)
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    return data, rate
+
+
+def open_raw(path, rate=SAMPLE_RATE, dtype="<i2", channels=1):
+    """(memmap of frames x channels, rate) for headerless PCM."""
+    itemsize = np.dtype(dtype).itemsize * channels
+    frames = os.path.getsize(path) // itemsize
+    return np.memmap(path, dtype=dtype, mode="r", shape=(frames, channels)), rate
+
+
+def open_pcm(path, **raw_format):
+    if path.lower().endswith(_RAW_EXTENSIONS):
+        return open_raw(path, **raw_format)
+    return open_wav(path)
+
+
+def resample(x, src_rate, dst_rate):
+    """Band-limited polyphase resampling (scipy), or linear interpolation without it."""
+    if src_rate == dst_rate:
+        return x
+    try:
+        from scipy.signal import resample_poly
+    except ImportError:
+        n = int(round(len(x) * dst_rate / src_rate))
+        return np.interp(np.arange(n) * (src_rate / dst_rate), np.arange(len(x)), x).astype(np.float32)
+    g = gcd(int(src_rate), int(dst_rate))
+    return resample_poly(x, dst_rate // g, src_rate // g).astype(np.float32)
+
+
+def int24_to_int32(x):
+    """Little-endian 3-byte samples (a "V3" array) as int32, full scale to full scale."""
+    b = np.ascontiguousarray(x).view(np.uint8).reshape(x.shape + (3,)).astype(np.int32)
+    # Into the top three bytes: the sign bit lands on int32's own
+    return (b[..., 0] << 8) | (b[..., 1] << 16) | (b[..., 2] << 24)
+
+
+def to_int16(x):
+    """Converts any supported sample dtype to int16, full scale to full scale."""
+    if x.dtype.kind == "V":
+        x = int24_to_int32(x)
+    if x.dtype == np.int16:
+        return np.asarray(x)
+    if x.dtype == np.uint8:
+        return ((x.astype(np.int16) - 128) << 8).astype(np.int16)
+    if x.dtype.kind == "i":
+        return (x >> (8 * x.dtype.itemsize - 16)).astype(np.int16)
+    return (np.clip(x, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def convert_pcm(path, size, mtime_ns, raw_format=(), version=None):
+    """The file as int16 mono at SAMPLE_RATE. size, mtime and version only key the cache."""
+    data, rate = open_pcm(path, **dict(raw_format))
+    if data.shape[1] == 1 and rate == SAMPLE_RATE:
+        return to_int16(data[:, 0])
+    # Mix down and resample in float, full scale = 1.0
+    mono = to_int16(data).astype(np.float32).mean(axis=1) / 32768.0
+    return to_int16(resample(mono, rate, SAMPLE_RATE))
+
+
+def load_sample(path, **raw_format):
+    """Read-only int16 mono array at SAMPLE_RATE for a WAV or raw PCM file.
+
+    Returns the file's own memory map when no conversion is needed, else the
+    cached conversion (also memory-mapped). raw_format: rate, dtype, channels.
+    """
+    path = os.path.abspath(path)
+    data, rate = open_pcm(path, **raw_format)
+    if data.dtype == np.int16 and data.shape[1] == 1 and rate == SAMPLE_RATE:
+        return data[:, 0]
+    st = os.stat(path)
+    return sample_cache.cached(convert_pcm, path, st.st_size, st.st_mtime_ns, tuple(sorted(raw_format.items())),
+                               convert_version())
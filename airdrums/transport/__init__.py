@@ -0,0 +1,239 @@
+"""Byte sources for the hit readers.
+
+    SerialTransport     the real receiver on a serial port
+    ReplayTransport     a recorded session, at original timing or N x speed
+    SyntheticTransport  generated hits at blast-beat rates (hundreds per second)
+    RecordingTransport  wraps any of the above and records what it reads
+    PipeTransport       runs one without a file descriptor behind a pipe
+
+All of them have read() -> bytes, returning everything available (or waiting
+up to `timeout` for the first byte) and close(). open_transport() picks one
+from a port string so the scripts can switch with a single setting:
+
+    /dev/ttyUSB0                  serial port
+    replay:session.rec            replay at recorded speed
+    replay:session.rec@4          replay 4x faster
+    synthetic:500                 500 hits/s from sticks 1 and 2
+    synthetic:500:3+4             500 hits/s from sticks 3 and 4
+
+Several receivers at once are read by reader.MultiReader.
+
+Recordings are text, one read per line: "<seconds since start> <hex bytes>".
+They keep the original chunking, so either serial protocol replays exactly.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from . import protocol
+
+
+class SerialTransport:
+    def __init__(self, port, baud, timeout=0.1):
+        import serial  # pyserial, only needed for real hardware
+        self.ser = serial.Serial(port, baud, timeout=timeout)
+
+    def read(self):
+        return self.ser.read(self.ser.in_waiting or 1)
+
+    def fileno(self):
+        return self.ser.fileno()
+
+    def close(self):
+        self.ser.close()
+
+
+def load_recording(path):
+    """[(seconds, bytes), ...] from a recording file."""
+    chunks = []
+    with open(path) as f:
+        for line in f:
+            t, _, payload = line.strip().partition(" ")
+            if t:
+                chunks.append((float(t), bytes.fromhex(payload)))
+    return chunks
+
+
+class ReplayTransport:
+    """Plays a recording back with its original gaps divided by `speed`."""
+
+    def __init__(self, path, speed=1.0, timeout=0.1, loop=False):
+        self.chunks = load_recording(path)
+        self.speed = speed
+        self.timeout = timeout
+        self.loop = loop
+        self._i = 0
+        self._t0 = time.perf_counter()
+        self.scheduled = [] # (due perf_counter time, chunk) as delivered, for the stress driver
+
+    def _due(self, i):
+        return self._t0 + self.chunks[i][0] / self.speed
+
+    def read(self):
+        if self._i >= len(self.chunks):
+            if not self.loop or not self.chunks:
+                time.sleep(self.timeout)
+                return b""
+            self._i, self._t0 = 0, time.perf_counter()
+        wait = self._due(self._i) - time.perf_counter()
+        if wait > self.timeout:
+            time.sleep(self.timeout)
+            return b""
+        if wait > 0:
+            time.sleep(wait)
+        # Hand over everything that is due by now in one read, like in_waiting would
+        now = time.perf_counter()
+        out = bytearray()
+        while self._i < len(self.chunks) and self._due(self._i) <= now:
+            out += self.chunks[self._i][1]
+            self.scheduled.append((self._due(self._i), self.chunks[self._i][1]))
+            self._i += 1
+        return bytes(out)
+
+    def close(self):
+        pass
+
+
+class SyntheticTransport:
+    """Generates hits at `rate` per second, round robin over `sticks`.
+
+    Uses binary frames with per-stick sequence numbers by default so the
+    stress driver can match every received hit to the moment it was sent
+    (sent[(sid, seq)] = due time).
+    """
+
+    def __init__(self, rate=300.0, sticks=(1, 2), binary=True, timeout=0.1, count=None, seed=0):
+        self.rng = np.random.RandomState(seed)
+        self.interval = 1.0 / rate
+        self.sticks = sticks
+        self.binary = binary
+        self.timeout = timeout
+        self.count = count
+        self.n = 0
+        self._seq = {sid: 0 for sid in sticks}
+        self._t0 = time.perf_counter()
+        self.sent = {}
+
+    def _encode(self, sid, due):
+        intensity = int(self.rng.randint(50, 256))
+        mode = int(self.rng.randint(0, 2))
+        seq = self._seq[sid]
+        self._seq[sid] = (seq + 1) & 0xFFFF
+        self.sent[(sid, seq)] = due
+        if self.binary:
+            return protocol.encode_frame(sid, intensity, mode, seq, int((due - self._t0) * 1000))
+        return f"{sid}:{intensity}:{mode}\r\n".encode()
+
+    def read(self):
+        if self.count is not None and self.n >= self.count:
+            time.sleep(self.timeout)
+            return b""
+        due = self._t0 + self.n * self.interval
+        wait = due - time.perf_counter()
+        if wait > self.timeout:
+            time.sleep(self.timeout)
+            return b""
+        if wait > 0:
+            time.sleep(wait)
+        out = bytearray()
+        now = time.perf_counter()
+        while (self.count is None or self.n < self.count) and self._t0 + self.n * self.interval <= now:
+            due = self._t0 + self.n * self.interval
+            out += self._encode(self.sticks[self.n % len(self.sticks)], due)
+            self.n += 1
+        return bytes(out)
+
+    def close(self):
+        pass
+
+
+class RecordingTransport:
+    """Passes reads through and appends them to a recording file."""
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self._f = open(path, "w", buffering=1) # Line buffered: the readers run in daemon threads
+        self._t0 = time.perf_counter()
+
+    def read(self):
+        data = self.inner.read()
+        if data:
+            self._f.write(f"{time.perf_counter() - self._t0:.6f} {data.hex()}\n")
+        return data
+
+    def fileno(self):
+        return self.inner.fileno()
+
+    def close(self):
+        self._f.close()
+        self.inner.close()
+
+
+class PipeTransport:
+    """Makes a transport without a file descriptor (replay, synthetic) selectable.
+
+    A daemon thread keeps calling the inner read() and writes into a pipe;
+    read() here never blocks, it returns whatever the pipe holds.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self._r, self._w = os.pipe()
+        os.set_blocking(self._r, False)
+        self._closed = False
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self):
+        while not self._closed:
+            data = self.inner.read()
+            if data:
+                os.write(self._w, data)
+
+    def read(self):
+        try:
+            return os.read(self._r, 65536)
+        except BlockingIOError:
+            return b""
+
+    def fileno(self):
+        return self._r
+
+    def close(self):
+        self._closed = True
+        self.inner.close()
+
+
+def open_transport(port, baud=115200, timeout=0.1, record=None):
+    """Transport for a port string (see module docstring), optionally recorded."""
+    if port.startswith("replay:"):
+        path, _, speed = port[len("replay:"):].partition("@")
+        t = ReplayTransport(path, float(speed or 1.0), timeout)
+    elif port.startswith("synthetic:"):
+        rate, _, sticks = port[len("synthetic:"):].partition(":")
+        sticks = tuple(int(s) for s in sticks.split("+")) if sticks else (1, 2)
+        t = SyntheticTransport(float(rate or 300), sticks, timeout=timeout)
+    else:
+        t = SerialTransport(port, baud, timeout)
+    return RecordingTransport(t, record) if record else t
+
+
+def serve_pty(transport):
+    """Feeds a transport into a new pseudo-terminal and returns the slave path.
+
+    Lets unmodified tools (or the Arduino-free scripts) open the replay like a
+    real serial port. The feeding thread is a daemon.
+    """
+    import pty
+    master, slave = pty.openpty()
+
+    def pump():
+        while True:
+            data = transport.read()
+            if data:
+                os.write(master, data)
+
+    threading.Thread(target=pump, daemon=True).start()
+    return os.ttyname(slave)
+
@@ -0,0 +1,23 @@
+"""python -m airdrums.transport replay:session.rec@2  -> serves it on a pty until Ctrl+C"""
+import sys
+import time
+
+from . import __doc__ as usage, open_transport, serve_pty
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print(usage)
+        return 1
+    print(f"Serving {argv[0]} on {serve_pty(open_transport(argv[0]))}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
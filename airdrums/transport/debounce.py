@@ -0,0 +1,76 @@
+"""Per-stick hit filter: drops double triggers, keeps fast rolls.
+
+A swing often fires the stick twice: a ringing echo a few tens of ms after
+the real hit, or the same frame twice when the radio retransmits. A fixed
+cooldown long enough to catch echoes also eats the second note of a fast
+roll, so the refractory window here follows each stick's own playing:
+
+    window = clamp(ratio * recent inter-hit interval, min_gap, max_gap)
+             * (0.5 + 0.5 * last intensity / 255)
+
+Inside min_gap everything is dropped ("refractory"). Inside the window a hit
+is only an echo if it is clearly weaker than the one it follows; a stronger
+hit (a flam, an accent) still plays. Same sequence number, or same intensity
+within merge_window, is a retransmitted "duplicate".
+
+Times are whatever monotonic clock the caller passes; reader.MultiReader's
+event time follows the receiver's millis when the frames carry them, so USB
+batching doesn't squeeze hits together. Each hit costs a dict lookup and a
+few comparisons.
+"""
+import collections
+
+REASONS = ("duplicate", "refractory", "echo")
+
+
+class HitFilter:
+    def __init__(self, min_gap=0.025, max_gap=0.110, ratio=0.5, echo_ratio=0.6,
+                 merge_window=0.004, smoothing=0.3):
+        self.min_gap = min_gap           # s, nothing closer than this is a new hit
+        self.max_gap = max_gap           # s, the longest window, the firmware's old fixed gap
+        self.ratio = ratio               # Window as a fraction of the recent inter-hit interval
+        self.echo_ratio = echo_ratio     # Weaker than this x the last intensity = echo
+        self.merge_window = merge_window # s, same intensity this close = retransmission
+        self.smoothing = smoothing       # Weight of the newest interval in the running average
+        self._sticks = {} # sid -> [last time, last intensity, last seq, average interval]
+        self.accepted = collections.Counter() # per stick
+        self.rejected = {reason: collections.Counter() for reason in REASONS}
+
+    def check(self, hit, t):
+        """None if the hit should play, otherwise the reason it was dropped. t: seconds."""
+        state = self._sticks.get(hit.sid)
+        if state is None:
+            self._sticks[hit.sid] = [t, hit.intensity, hit.seq, self.max_gap / self.ratio]
+            return None
+        last_t, last_intensity, last_seq, interval = state
+        dt = t - last_t
+
+        if hit.seq is not None and hit.seq == last_seq:
+            return "duplicate"
+        if 0 <= dt < self.merge_window and hit.intensity == last_intensity:
+            return "duplicate"
+        if 0 <= dt < self.min_gap:
+            return "refractory"
+        if 0 <= dt:
+            window = min(max(self.ratio * interval, self.min_gap), self.max_gap)
+            window *= 0.5 + 0.5 * last_intensity / 255
+            if dt < window and hit.intensity < self.echo_ratio * last_intensity:
+                return "echo"
+            # A pause between phrases must not stretch the window for the next roll
+            interval += self.smoothing * (min(dt, self.max_gap / self.ratio) - interval)
+        # dt < 0: the clock restarted, start the stick over
+        state[:] = t, hit.intensity, hit.seq, interval
+        return None
+
+    def accept(self, hit, t):
+        """check() plus the counters: True if the hit should play."""
+        reason = self.check(hit, t)
+        if reason is None:
+            self.accepted[hit.sid] += 1
+            return True
+        self.rejected[reason][hit.sid] += 1
+        return False
+
+    def summary(self):
+        dropped = " ".join(f"{r} {sum(c.values())}" for r, c in self.rejected.items())
+        return f"hits {sum(self.accepted.values())} | dropped {dropped}"
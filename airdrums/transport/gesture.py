@@ -0,0 +1,170 @@
+"""Hit detection and zone classification from raw IMU streams (stick STREAM_IMU).
+
+The stick firmware only knows "jerk above 25 -> hit with velocity X". With
+the raw samples (about 100 Hz per stick) the laptop can also tell where the
+stick was pointing when it hit:
+
+    jerk        |accel[t] - accel[t-1]|, the firmware's trigger signal
+    peak        a jerk sample above `threshold` that beats its neighbours;
+                one sample of look-ahead, so ~10 ms of added latency
+    direction   unit vector of the accel change at the peak (the swing)
+    rotation    largest gyro magnitude over the `swing` samples up to it
+    pitch       stick angle from gravity, averaged over `rest` samples
+                from before the swing started
+
+The pitch picks the zone and the zone is the Hit's mode, which is what the
+kits switch instruments on (laptop.json: 0 = snare/kick, 1 = hats). Every
+stick has a ring buffer of `window` samples in one (sticks, window, 6)
+array, so each batch from the reader is scored for all sticks with a
+handful of NumPy operations, whatever the number of sticks.
+
+Sticks keep sending their own trigger frames. While a stick's IMU stream is
+alive those are dropped in favour of the detected hits; once it has been
+quiet for `stale` seconds they count again (trigger_ok()).
+
+An IMU frame is 22 bytes, so 115200 baud (~11.5 kB/s) carries about four
+streaming sticks per receiver at 100 Hz.
+"""
+import collections
+import time
+
+import numpy as np
+
+from .protocol import ACCEL_SCALE, GYRO_SCALE, Hit
+
+Gesture = collections.namedtuple("Gesture", "sid millis intensity peak direction rotation pitch zone")
+
+# (lowest pitch in degrees, mode): the highest one the pitch reaches wins
+ZONES = ((-90.0, 0), (25.0, 1)) # Stick raised more than 25 degrees = hats
+
+
+def intensity_for(jerk, threshold):
+    """The firmware's map(jerk, 25, 100, 50, 255), constrained to 50-255."""
+    return np.clip((jerk - threshold) * (255 - 50) / (100 - threshold) + 50, 50, 255).astype(int)
+
+
+class GestureDetector:
+    def __init__(self, threshold=25.0, window=16, swing=6, rest=4, zones=ZONES, stale=0.5):
+        self.threshold = threshold # Jerk (m/s^2 per sample) that counts as a hit, as on the stick
+        self.window = window       # Samples kept per stick (160 ms at 100 Hz)
+        self.swing = swing         # Samples up to the peak searched for the rotation
+        self.rest = rest           # Samples before the swing averaged for the stick angle
+        self.zones = sorted(zones) # Empty: keep the stick's button mode
+        self.stale = stale         # s without IMU samples before the stick's own trigger counts again
+        self._sids = []            # Row -> stick id
+        self._rows = {}            # Stick id -> row in the buffers
+        self._data = np.zeros((0, window, 6), np.float32) # accel xyz (m/s^2), gyro xyz (rad/s)
+        self._millis = np.zeros((0, window), np.int64)
+        self._fill = np.zeros(0, int)   # Valid samples per row, up to window
+        self._fresh = np.zeros(0, int)  # Samples added since the last detect, per row
+        self._button = np.zeros(0, int) # Latest button mode per row
+        self._seen = {}                 # Stick id -> time of its last IMU sample
+        self.recent = collections.deque(maxlen=64)     # Last Gestures, for a display
+        self.compute_s = collections.deque(maxlen=4096) # Seconds per feed() batch
+        self.batches = 0
+        self.windows = 0                # Stick windows scored
+        self.detected = 0
+
+    def _row(self, sid):
+        row = self._rows.get(sid)
+        if row is None:
+            row = self._rows[sid] = len(self._sids)
+            self._sids.append(sid)
+            self._data = np.concatenate([self._data, np.zeros((1, self.window, 6), np.float32)])
+            self._millis = np.concatenate([self._millis, np.zeros((1, self.window), np.int64)])
+            self._fill, self._fresh, self._button = (np.append(a, 0) for a in (self._fill, self._fresh, self._button))
+        return row
+
+    def feed(self, samples, now=None):
+        """IMU_DTYPE samples (decoder.take_imu()) -> Hits detected in them, oldest first."""
+        if not len(samples):
+            return []
+        start = time.perf_counter()
+        now = start if now is None else now
+        values = np.empty((len(samples), 6), np.float32)
+        values[:, :3] = samples["accel"] / ACCEL_SCALE
+        values[:, 3:] = samples["gyro"] / GYRO_SCALE
+        # Shift each stick's ring buffer once per batch, not once per sample
+        for sid in np.unique(samples["sid"]).tolist():
+            self._seen[sid] = now
+            row = self._row(sid)
+            mine = samples["sid"] == sid
+            new, millis = values[mine][-self.window:], samples["millis"][mine][-self.window:]
+            n = len(new)
+            self._data[row, :-n] = self._data[row, n:]
+            self._data[row, -n:] = new
+            self._millis[row, :-n] = self._millis[row, n:]
+            self._millis[row, -n:] = millis
+            self._fill[row] = min(self._fill[row] + n, self.window)
+            self._fresh[row] = min(self._fresh[row] + n, self.window)
+            self._button[row] = samples["mode"][mine][-1]
+        hits = self.detect()
+        self.batches += 1
+        self.compute_s.append(time.perf_counter() - start)
+        return hits
+
+    def detect(self):
+        """Scores the window of every stick with new samples, all at once."""
+        rows = np.flatnonzero(self._fresh)
+        data, fill, fresh = self._data[rows], self._fill[rows], self._fresh[rows]
+        self._fresh[rows] = 0
+        self.windows += len(rows)
+        w = self.window
+        accel, gyro = data[:, :, :3], data[:, :, 3:]
+
+        step = np.diff(accel, axis=1)           # Jerk j is accel j + 1 - accel j
+        jerk = np.linalg.norm(step, axis=2)
+        j = np.arange(1, w - 2)                 # Jerk index of each candidate column
+        mid = jerk[:, 1:-1]
+        peaks = (mid > self.threshold) & (mid >= jerk[:, :-2]) & (mid > jerk[:, 2:])
+        # Decided by this batch: the look-ahead sample (accel j + 2) is new; older
+        # ones were reported last time. And jerk j - 1 must come from real samples.
+        peaks &= (j >= w - 2 - fresh[:, None]) & (j >= w - fill[:, None] + 1)
+        stick, col = np.nonzero(peaks)
+        if not len(stick):
+            return []
+        i = j[col]
+        hit_at = i + 1                          # The impact sample
+
+        peak = jerk[stick, i]
+        direction = step[stick, i] / peak[:, None]
+        back = hit_at[:, None] - np.arange(self.swing)[None, :]
+        back = np.maximum(back, (w - fill[stick])[:, None])
+        rotation = np.linalg.norm(gyro[stick[:, None], back], axis=2).max(axis=1)
+        # Gravity while the stick was still, just before the swing
+        before = hit_at[:, None] - self.swing - np.arange(self.rest)[None, :]
+        before = np.maximum(before, (w - fill[stick])[:, None])
+        g = accel[stick[:, None], before].mean(axis=1)
+        pitch = np.degrees(np.arctan2(-g[:, 0], np.hypot(g[:, 1], g[:, 2])))
+        intensity = intensity_for(peak, self.threshold)
+
+        millis = self._millis[rows[stick], hit_at]
+        hits = []
+        for k in np.argsort(millis, kind="stable").tolist():
+            row = int(rows[stick[k]])
+            gesture = Gesture(self._sids[row], int(millis[k]), int(intensity[k]), float(peak[k]),
+                              direction[k].tolist(), float(rotation[k]), float(pitch[k]),
+                              self.zone(pitch[k], int(self._button[row])))
+            self.recent.append(gesture)
+            hits.append(Hit(gesture.sid, gesture.intensity, gesture.zone, None, gesture.millis))
+        self.detected += len(hits)
+        return hits
+
+    def zone(self, pitch, button_mode):
+        mode = button_mode
+        for lowest, zone_mode in self.zones:
+            if pitch >= lowest:
+                mode = zone_mode
+        return mode
+
+    def trigger_ok(self, sid, now):
+        """Whether the stick's own trigger frames should play (its IMU stream is quiet)."""
+        return now - self._seen.get(sid, float("-inf")) > self.stale
+
+    def summary(self):
+        if not self.compute_s:
+            return "gestures: no IMU data"
+        us = np.array(self.compute_s) * 1e6
+        per_window = us.sum() / max(self.windows, 1)
+        return (f"gestures {self.detected} | batch p50 {np.percentile(us, 50):.0f} / p99 {np.percentile(us, 99):.0f} us"
+                f" | {per_window:.0f} us per stick window")
@@ -0,0 +1,157 @@
+"""Per-stick link accounting: lost, duplicated and reordered hits, radio delay.
+
+ESP-NOW is fire and forget: a hit can vanish, arrive twice (the MAC layer
+retries when an ACK gets lost) or overtake the one before it. Sticks that
+number their hits (stamped frames, see protocol.py) let the laptop tell
+these apart by sequence number:
+
+    next expected       in order
+    ahead of it         the seqs skipped are counted lost (for now)
+    one of those later  reordered: it wasn't lost after all
+    already seen        duplicate, observe() says so and the reader drops it
+    restarted           the stick (or receiver) rebooted and counts from 0 again:
+                        its sent_us jumped back, or without one, the seq is 0
+                        or too far behind to be a retry; the hit plays
+
+The stick and receiver clocks (micros(), both wrapping every ~71 minutes)
+are unrelated, so the offset between them is estimated from the fastest
+packet seen, allowed to creep up slowly for crystal drift. A hit's radio
+delay is reported relative to that fastest one: it is the queueing and
+retry delay on top of the air time, which can't be measured one way.
+
+Hits with a seq but no stick timestamp (the receiver numbers them, 0xA5
+frames) still get the seq accounting, which then covers the serial link only.
+"""
+import collections
+
+import numpy as np
+
+WINDOW = 256          # Recent seqs remembered per stick for duplicate/reorder checks
+RESTART_BEHIND = 1024 # A seq this far ahead of the newest means the stick restarted
+RESTART_SENT_US = 1_000_000 # sent_us this far behind the newest means it restarted (reordering is ms)
+OFFSET_CREEP = 0.001  # Share of a slower packet's offset taken over (clock drift)
+DELAYS = 2048         # Radio delays kept per stick for the percentiles
+
+
+def _signed(diff, bits):
+    """A modular difference as a signed number (counters that wrap)."""
+    half = 1 << (bits - 1)
+    return (diff + half) % (1 << bits) - half
+
+
+class StickLink:
+    def __init__(self):
+        self.newest = None                      # Highest seq so far
+        self.sent_us = None                     # Latest stick timestamp so far
+        self.seen = collections.OrderedDict()   # seq -> lost before it arrived
+        self.offset_us = None                   # recv_us - sent_us of the fastest packet
+        self.delays = np.full(DELAYS, np.nan)   # ms above the fastest, ring buffer
+        self.n_delays = 0
+        self.received = self.lost = self.duplicates = self.reordered = self.restarts = 0
+
+    def _remember(self, seq, missing):
+        self.seen[seq] = missing
+        if len(self.seen) > WINDOW:
+            self.seen.popitem(last=False)
+
+    def _rebooted(self, seq, sent_us, ahead):
+        # A retry is never further behind than the window, nor far ahead
+        if ahead >= RESTART_BEHIND or (ahead <= -WINDOW and seq not in self.seen):
+            return True
+        if sent_us is not None and self.sent_us is not None:
+            return _signed(sent_us - self.sent_us, 32) < -RESTART_SENT_US
+        # Receiver-numbered, no clock to go by: numbering starting over at 0
+        return seq == 0 and ahead < 0
+
+    def observe(self, seq, sent_us, recv_us):
+        """'ok', 'duplicate', 'reordered' or 'restart'."""
+        status = "ok"
+        if self.newest is None:
+            self.newest = seq
+        else:
+            ahead = _signed(seq - self.newest, 16)
+            if self._rebooted(seq, sent_us, ahead):
+                self.restarts += 1
+                self.seen.clear()
+                self.offset_us = None
+                self.sent_us = None
+                self.newest = seq
+                status = "restart"
+            elif 0 < ahead < RESTART_BEHIND:
+                self.lost += ahead - 1
+                for skipped in range(max(ahead - 1 - WINDOW, 0) + 1, ahead):
+                    self._remember((self.newest + skipped) & 0xFFFF, True)
+                self.newest = seq
+            elif self.seen.get(seq) is True:
+                self.lost -= 1
+                self.reordered += 1
+                status = "reordered"
+            else:
+                self.duplicates += 1
+                return "duplicate"
+        self._remember(seq, False)
+        self.received += 1
+        if sent_us is not None and (self.sent_us is None or _signed(sent_us - self.sent_us, 32) > 0):
+            self.sent_us = sent_us
+
+        if sent_us is not None:
+            offset = _signed(recv_us - sent_us, 32)
+            if self.offset_us is None or offset < self.offset_us:
+                self.offset_us = offset
+            else:
+                self.offset_us += OFFSET_CREEP * (offset - self.offset_us)
+            self.delays[self.n_delays % DELAYS] = (offset - self.offset_us) / 1000
+            self.n_delays += 1
+        return status
+
+
+class LinkStats:
+    """StickLinks by stick id, plus totals for the HUD and the exit report."""
+
+    def __init__(self):
+        self.sticks = {}
+
+    def observe(self, hit):
+        """Status of the hit (see StickLink.observe); hits without a seq are always 'ok'."""
+        if hit.seq is None:
+            return "ok"
+        link = self.sticks.get(hit.sid)
+        if link is None:
+            link = self.sticks[hit.sid] = StickLink()
+        recv_us = round(hit.millis * 1000) if hit.sent_us is not None else None
+        return link.observe(hit.seq, hit.sent_us, recv_us)
+
+    def totals(self):
+        keys = ("received", "lost", "duplicates", "reordered", "restarts")
+        return {k: sum(getattr(link, k) for link in self.sticks.values()) for k in keys}
+
+    def delay_percentiles(self, q=(50, 99)):
+        d = np.concatenate([link.delays for link in self.sticks.values()] or [np.empty(0)])
+        d = d[~np.isnan(d)]
+        return np.percentile(d, q) if len(d) else None
+
+    def summary(self):
+        t = self.totals()
+        if not t["received"] and not t["duplicates"]:
+            return "link: no numbered hits"
+        expected = t["received"] + t["lost"]
+        line = (f"link: lost {t['lost']} ({t['lost'] / max(expected, 1):.1%}) dup {t['duplicates']}"
+                f" reord {t['reordered']}")
+        if t["restarts"]:
+            line += f" restarts {t['restarts']}"
+        p = self.delay_percentiles()
+        if p is not None:
+            line += f" | radio +p50 {p[0]:.1f} / p99 {p[1]:.1f} ms"
+        return line
+
+    def report(self):
+        """One line per stick for the exit report."""
+        lines = []
+        for sid, link in sorted(self.sticks.items()):
+            d = link.delays[~np.isnan(link.delays)]
+            delay = f", radio +p50 {np.percentile(d, 50):.1f} / p99 {np.percentile(d, 99):.1f} ms" if len(d) else ""
+            lines.append(f"stick {sid}: received {link.received}, lost {link.lost}, duplicates {link.duplicates},"
+                         f" reordered {link.reordered}, restarts {link.restarts}"
+                         + (f", clock offset {link.offset_us / 1000:.1f} ms" if link.offset_us is not None else "")
+                         + delay)
+        return lines
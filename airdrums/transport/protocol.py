@@ -0,0 +1,195 @@
+"""Serial protocol between receiver.ino and the laptop.
+
+Two formats, detected automatically from the byte stream:
+
+ASCII (old firmware)   "ID:INTENSITY:MODE\\n"  (laptop2-era "ID:INTENSITY\\n" too)
+Binary frame           11 bytes, little endian:
+
+    0xA5 | id u8 | intensity u8 | mode u8 | seq u16 | millis u32 | xor u8
+
+Stamped frame          15 bytes, from sticks that number their hits:
+
+    0xA6 | id u8 | intensity u8 | mode u8 | seq u16 | sent_us u32 | recv_us u32 | xor u8
+
+    seq and sent_us (micros()) come from the stick, recv_us from the receiver;
+    the Hit gets millis = recv_us / 1000 and sent_us for link.LinkStats
+
+IMU frame              22 bytes, one raw MPU6050 sample (stick STREAM_IMU):
+
+    0xA7 | id u8 | mode u8 | seq u16 | millis u32 | ax ay az gx gy gz i16 | xor u8
+
+    accel in 1/ACCEL_SCALE m/s^2, gyro in 1/GYRO_SCALE rad/s
+
+The checksum is the XOR of the bytes between the sync byte and itself. The
+sync bytes are all above 0x7F, so a text line can't pass for a frame and
+lock an auto-detecting decoder into binary mode.
+Binary frames are decoded in batches with numpy.frombuffer; garbage (boot
+messages, line noise) is skipped by resyncing on the next valid frame. IMU
+samples don't become Hits here, they wait in the decoder for take_imu().
+"""
+import collections
+import struct
+
+import numpy as np
+
+SYNC = 0xA5
+FRAME = struct.Struct("<BBBBHIB")
+FRAME_SIZE = FRAME.size
+FRAME_DTYPE = np.dtype([("sync", "u1"), ("sid", "u1"), ("intensity", "u1"), ("mode", "u1"),
+                        ("seq", "<u2"), ("millis", "<u4"), ("xor", "u1")])
+STAMPED_SYNC = 0xA6
+STAMPED_FRAME = struct.Struct("<BBBBHIIB")
+STAMPED_FRAME_SIZE = STAMPED_FRAME.size
+STAMPED_DTYPE = np.dtype([("sync", "u1"), ("sid", "u1"), ("intensity", "u1"), ("mode", "u1"),
+                          ("seq", "<u2"), ("sent_us", "<u4"), ("recv_us", "<u4"), ("xor", "u1")])
+IMU_SYNC = 0xA7
+IMU_FRAME = struct.Struct("<BBBHI6hB")
+IMU_FRAME_SIZE = IMU_FRAME.size
+IMU_DTYPE = np.dtype([("sync", "u1"), ("sid", "u1"), ("mode", "u1"), ("seq", "<u2"), ("millis", "<u4"),
+                      ("accel", "<i2", 3), ("gyro", "<i2", 3), ("xor", "u1")])
+ACCEL_SCALE = 100  # counts per m/s^2 (+-327 m/s^2, the MPU6050 tops out at 16 g)
+GYRO_SCALE = 1000  # counts per rad/s (+-32 rad/s, about its 2000 deg/s range)
+FRAMES = {SYNC: (FRAME_SIZE, FRAME_DTYPE), STAMPED_SYNC: (STAMPED_FRAME_SIZE, STAMPED_DTYPE),
+          IMU_SYNC: (IMU_FRAME_SIZE, IMU_DTYPE)}
+MAX_TEXT_BUFFER = 256 # Undecoded bytes kept while waiting for a newline/frame
+
+Hit = collections.namedtuple("Hit", "sid intensity mode seq millis sent_us", defaults=(None,))
+
+
+def checksum(payload):
+    x = 0
+    for b in payload:
+        x ^= b
+    return x
+
+
+def encode_frame(sid, intensity, mode, seq, millis):
+    """Builds one binary frame (used by tests/replay tools; the firmware does the same)."""
+    body = FRAME.pack(SYNC, sid, intensity, mode, seq & 0xFFFF, millis & 0xFFFFFFFF, 0)[:-1]
+    return body + bytes([checksum(body[1:])])
+
+
+def encode_stamped_frame(sid, intensity, mode, seq, sent_us, recv_us):
+    """One stamped frame, as receiver.ino builds it for numbered sticks."""
+    body = STAMPED_FRAME.pack(STAMPED_SYNC, sid, intensity, mode, seq & 0xFFFF,
+                              sent_us & 0xFFFFFFFF, recv_us & 0xFFFFFFFF, 0)[:-1]
+    return body + bytes([checksum(body[1:])])
+
+
+def encode_imu_frame(sid, mode, seq, millis, accel, gyro):
+    """One IMU frame from accel (m/s^2) and gyro (rad/s) triples."""
+    ints = [int(round(v * ACCEL_SCALE)) for v in accel] + [int(round(v * GYRO_SCALE)) for v in gyro]
+    ints = [min(max(v, -32768), 32767) for v in ints]
+    body = IMU_FRAME.pack(IMU_SYNC, sid, mode, seq & 0xFFFF, millis & 0xFFFFFFFF, *ints, 0)[:-1]
+    return body + bytes([checksum(body[1:])])
+
+
+def _find_sync(buf, pos):
+    found = [i for i in (buf.find(kind, pos) for kind in FRAMES) if i >= 0]
+    return min(found) if found else -1
+
+
+def parse_line(line):
+    """ASCII 'ID:INTENSITY[:MODE]' -> Hit, or None for anything else."""
+    parts = line.split(b":")
+    if len(parts) not in (2, 3):
+        return None
+    try:
+        values = [int(p) for p in parts]
+    except ValueError:
+        return None
+    return Hit(values[0], values[1], values[2] if len(values) == 3 else 0, None, None)
+
+
+class HitDecoder:
+    """Turns raw serial bytes into Hits. Feed it whatever in_waiting returned."""
+
+    def __init__(self, mode="auto"):
+        if mode not in ("auto", "ascii", "binary"):
+            raise ValueError(f"Unknown protocol mode: {mode}")
+        self.mode = mode
+        self._buf = bytearray()
+        self.frames = 0
+        self.imu_frames = 0
+        self._imu = []       # IMU_DTYPE batches waiting for take_imu()
+        self.bad_bytes = 0   # skipped while resyncing
+
+    def feed(self, data):
+        self._buf += data
+        hits = []
+        if self.mode != "ascii":
+            imu_before = self.imu_frames
+            self._decode_frames(hits)
+            if hits or self.imu_frames > imu_before:
+                self.mode = "binary"
+        if self.mode != "binary":
+            self._decode_lines(hits)
+        return hits
+
+    # --- BINARY ---
+
+    def _decode_frames(self, hits):
+        buf = self._buf
+        pos = skipped = 0
+        imu_before = self.imu_frames
+        while True:
+            start = _find_sync(buf, pos)
+            if start < 0:
+                skipped += len(buf) - pos
+                pos = len(buf)
+                break
+            skipped += start - pos
+            kind = buf[start]
+            size, dtype = FRAMES[kind]
+            if len(buf) - start < size:
+                pos = start # Partial frame, wait for the rest
+                break
+            # Assume back-to-back frames of this kind from here and keep the valid prefix
+            n = (len(buf) - start) // size
+            raw = np.frombuffer(bytes(buf[start:start + n * size]), dtype=np.uint8).reshape(n, size)
+            ok = (raw[:, 0] == kind) & (np.bitwise_xor.reduce(raw[:, 1:-1], axis=1) == raw[:, -1])
+            good = n if ok.all() else int(np.argmin(ok))
+            if good == 0:
+                skipped += 1 # Sync byte that wasn't a frame
+                pos = start + 1
+                continue
+            frames = raw[:good].copy().view(dtype).ravel()
+            if kind == IMU_SYNC:
+                self._imu.append(frames)
+                self.imu_frames += good
+            elif kind == STAMPED_SYNC:
+                for f in frames.tolist():
+                    hits.append(Hit(f[1], f[2], f[3], f[4], f[6] / 1000, f[5]))
+                self.frames += good
+            else:
+                for f in frames.tolist():
+                    hits.append(Hit(f[1], f[2], f[3], f[4], f[5]))
+                self.frames += good
+            pos = start + good * size
+
+        if self.mode == "binary" or hits or self.imu_frames > imu_before:
+            self.bad_bytes += skipped
+            del buf[:pos]
+
+    def take_imu(self):
+        """IMU samples decoded since the last call, as one IMU_DTYPE array."""
+        if not self._imu:
+            return np.empty(0, IMU_DTYPE)
+        samples = self._imu[0] if len(self._imu) == 1 else np.concatenate(self._imu)
+        self._imu = []
+        return samples
+
+    # --- ASCII ---
+
+    def _decode_lines(self, hits):
+        buf = self._buf
+        end = buf.rfind(b"\n")
+        if end >= 0:
+            for line in bytes(buf[:end]).split(b"\n"):
+                hit = parse_line(line.strip())
+                if hit is not None:
+                    hits.append(hit)
+                    self.mode = "ascii"
+            del buf[:end + 1]
+        if len(buf) > MAX_TEXT_BUFFER:
+            del buf[:-MAX_TEXT_BUFFER]
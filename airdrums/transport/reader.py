@@ -0,0 +1,168 @@
+"""Reads several receivers from one thread and merges their hits in time order.
+
+    reader = MultiReader(["/dev/ttyUSB0", "/dev/ttyUSB1"])
+    while True:
+        for event in reader.poll():
+            play(event.hit)
+
+One selector waits on every port, so a quiet receiver never holds up a busy
+one and there is no thread per port. Each port has its own HitDecoder.
+
+Every hit gets a time on the host's perf_counter clock. Binary frames carry
+the receiver's millis, which is mapped onto the host clock with a per-port
+offset (the smallest arrival - millis seen, allowed to creep up slowly for
+drift); this orders hits that arrived in one USB batch, and hits from
+different receivers, by when they were actually received. ASCII hits use the
+arrival time. Events wait up to `reorder_ms` in a heap so a hit from a
+slightly slower port can still go out before a later one from a faster
+port; that window is the latency the merge costs. With a single port there
+is nothing to merge: its hits go out as soon as they are read (in time
+order within the read).
+
+Numbered hits go through a per-port link.LinkStats on the way in, before
+any other filter; the duplicates it spots are dropped here, before they can
+play twice.
+
+With gestures=True each port also runs a GestureDetector over the raw IMU
+frames of sticks that stream them; its hits join the same stream.
+"""
+import collections
+import heapq
+import itertools
+import selectors
+import time
+
+from . import PipeTransport, open_transport
+from .gesture import GestureDetector
+from .link import LinkStats
+from .protocol import HitDecoder
+
+Event = collections.namedtuple("Event", "time source arrived hit")
+
+OFFSET_CREEP = 0.001 # Share of a larger offset sample taken over (receiver clock drift)
+RESTART_JUMP = 1.0   # s, offset jump that means the receiver restarted
+
+
+class Port:
+    """One receiver: its transport, decoder, clock offset and counters."""
+
+    def __init__(self, name, transport, fd, gestures=False):
+        self.name = name
+        self.transport = transport
+        self.fd = fd
+        self.decoder = HitDecoder()
+        self.link = LinkStats()
+        self.gestures = GestureDetector() if gestures else None
+        self.offset = None  # host time - receiver time, s
+        self.opened = time.perf_counter()
+        self.reads = 0
+        self.bytes = 0
+        self.hits = 0
+        self.pending = 0    # Decoded, waiting in the reorder window
+        self.max_read = 0   # Largest single read: how far behind the reader got
+        self.late = 0       # Released after a newer hit from another port had already gone
+        self.error = None
+
+    def stamp(self, hit, arrived):
+        if hit.millis is None:
+            return arrived
+        sample = arrived - hit.millis / 1000
+        if self.offset is None or sample < self.offset or sample - self.offset > RESTART_JUMP:
+            self.offset = sample
+        else:
+            self.offset += OFFSET_CREEP * (sample - self.offset)
+        return hit.millis / 1000 + self.offset
+
+    def stats(self, now):
+        elapsed = max(now - self.opened, 1e-9)
+        return {"hits": self.hits, "hits_per_s": self.hits / elapsed, "bytes_per_s": self.bytes / elapsed,
+                "reads": self.reads, "pending": self.pending, "max_read": self.max_read, "late": self.late,
+                "lost": self.link.totals()["lost"], "bad_bytes": self.decoder.bad_bytes, "error": self.error}
+
+
+class MultiReader:
+    def __init__(self, ports, baud=115200, reorder_ms=4.0, record=None, gestures=False):
+        """ports: port strings for open_transport(); record: path, port i > 0 records to <path>.<i>"""
+        self.reorder = reorder_ms / 1000 if len(ports) > 1 else 0.0
+        self.selector = selectors.DefaultSelector()
+        self.ports = []
+        for i, name in enumerate(ports):
+            path = record and (record if i == 0 else f"{record}.{i}")
+            transport = open_transport(name, baud, timeout=0.1, record=path)
+            try:
+                fd = transport.fileno()
+            except AttributeError: # Replay or synthetic: give it a pipe to select on
+                transport = PipeTransport(transport)
+                fd = transport.fileno()
+            port = Port(name, transport, fd, gestures)
+            self.ports.append(port)
+            self.selector.register(fd, selectors.EVENT_READ, port)
+        self._heap = []
+        self._order = itertools.count() # Tie breaker, the heap never compares Events
+        self._released = float("-inf")
+
+    def poll(self, timeout=0.1):
+        """Reads whatever is ready; returns the events out of the reorder window, oldest first."""
+        if self._heap:
+            timeout = min(timeout, max(self._heap[0][0] + self.reorder - time.perf_counter(), 0))
+        if self.selector.get_map():
+            for key, _ in self.selector.select(timeout):
+                self._read(key.data)
+        else:
+            time.sleep(timeout) # Every port failed, don't spin
+        return self._release(time.perf_counter())
+
+    def _read(self, port):
+        try:
+            data = port.transport.read()
+        except OSError as e: # Unplugged: stop selecting it, the other ports carry on
+            port.error = str(e)
+            self.selector.unregister(port.fd)
+            return
+        arrived = time.perf_counter()
+        port.reads += 1
+        port.bytes += len(data)
+        port.max_read = max(port.max_read, len(data))
+        # Every numbered hit is accounted before anything drops it, or its seq would look lost
+        hits = [h for h in port.decoder.feed(data) if port.link.observe(h) != "duplicate"]
+        samples = port.decoder.take_imu() # Dropped unless there is a detector
+        if port.gestures:
+            # A stick that streams IMU data plays the detected hits, not its own trigger
+            hits = [h for h in hits if port.gestures.trigger_ok(h.sid, arrived)]
+            hits += port.gestures.feed(samples, arrived)
+        for hit in hits:
+            t = port.stamp(hit, arrived)
+            heapq.heappush(self._heap, (t, next(self._order), Event(t, port, arrived, hit)))
+            port.hits += 1
+            port.pending += 1
+
+    def _release(self, now):
+        out = []
+        heap, cutoff = self._heap, now - self.reorder
+        while heap and heap[0][0] <= cutoff:
+            event = heapq.heappop(heap)[2]
+            event.source.pending -= 1
+            if event.time < self._released:
+                event.source.late += 1
+            self._released = max(self._released, event.time)
+            out.append(event)
+        return out
+
+    def stats(self):
+        """{port name: counters}: throughput, backlog and errors per receiver."""
+        now = time.perf_counter()
+        return {port.name: port.stats(now) for port in self.ports}
+
+    def summary(self):
+        return " | ".join(f"{name} {s['hits_per_s']:.0f}/s backlog {s['max_read']}B late {s['late']}"
+                          + (" ERROR" if s["error"] else "") for name, s in self.stats().items())
+
+    def link_summary(self):
+        if len(self.ports) == 1:
+            return self.ports[0].link.summary()
+        return " | ".join(f"{port.name} {port.link.summary()}" for port in self.ports)
+
+    def close(self):
+        self.selector.close()
+        for port in self.ports:
+            port.transport.close()
@@ -0,0 +1,106 @@
+"""Load/latency test of the hit reader path, no receiver hardware needed.
+
+    python -m airdrums.transport.stress_test synthetic:800 --seconds 10
+    python -m airdrums.transport.stress_test replay:session.rec@4
+    python -m airdrums.transport.stress_test /dev/ttyUSB0 --seconds 30
+
+Reads through the same HitDecoder as the scripts and reports:
+    dropped    hits that were sent but never decoded (on hardware: the
+               seqs link.LinkStats counts lost, net of reordered ones)
+    delayed    hits decoded more than --late-ms after they were due
+    coalesced  hits that arrived in the same read as an earlier hit
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from . import ReplayTransport, SyntheticTransport, open_transport
+from .link import LinkStats
+from .protocol import HitDecoder
+
+
+def expected_hits(chunks):
+    """How many hits a list of recorded chunks contains, decoded in one go."""
+    decoder = HitDecoder()
+    return sum(len(decoder.feed(data)) for _, data in chunks)
+
+
+def run(transport, seconds, late_ms=5.0, work_ms=0.0):
+    """Drives the transport for `seconds`; work_ms simulates per-hit processing cost."""
+    source = getattr(transport, "inner", transport) # Unwrap a RecordingTransport for the bookkeeping
+    decoder = HitDecoder()
+    link = LinkStats()
+    delays, received, coalesced, reads = [], 0, 0, 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        data = transport.read()
+        now = time.perf_counter()
+        if not data:
+            continue
+        reads += 1
+        hits = decoder.feed(data)
+        coalesced += max(len(hits) - 1, 0)
+        if isinstance(source, ReplayTransport) and source.scheduled:
+            # The oldest chunk in this read decides how late the batch is
+            delays += [now - source.scheduled[0][0]] * len(hits)
+            source.scheduled.clear()
+        for hit in hits:
+            received += 1
+            link.observe(hit)
+            if isinstance(source, SyntheticTransport):
+                due = source.sent.get((hit.sid, hit.seq))
+                if due is not None:
+                    delays.append(time.perf_counter() - due)
+            if work_ms:
+                spin = time.perf_counter() + work_ms / 1000
+                while time.perf_counter() < spin:
+                    pass
+
+    if isinstance(source, SyntheticTransport):
+        sent = source.n
+    elif isinstance(source, ReplayTransport):
+        sent = expected_hits(source.chunks[:source._i])
+    else:
+        sent = received + link.totals()["lost"] # Real hardware: sequence gaps are all we can see
+
+    d = np.array(delays) * 1000.0
+    return {
+        "sent": sent,
+        "received": received,
+        "reads": reads,
+        "dropped": sent - received,
+        "seq_lost": link.totals()["lost"],
+        "delayed": int(np.sum(d > late_ms)),
+        "coalesced": coalesced,
+        "bad_bytes": decoder.bad_bytes,
+        "delay_ms": np.percentile(d, (50, 95, 99)) if len(d) else None,
+        "rate": received / seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress test the hit reader with a transport.")
+    parser.add_argument("port", help="serial port, replay:<file>[@speed] or synthetic:<hits/s>")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--late-ms", type=float, default=5.0, help="delay that counts as 'delayed'")
+    parser.add_argument("--work-ms", type=float, default=0.0, help="simulated processing per hit")
+    parser.add_argument("--record", help="also record the session to this file")
+    args = parser.parse_args(argv)
+
+    transport = open_transport(args.port, record=args.record)
+    stats = run(transport, args.seconds, args.late_ms, args.work_ms)
+    transport.close()
+
+    print(f"{stats['received']} hits in {stats['reads']} reads ({stats['rate']:.0f} hits/s), sent {stats['sent']}")
+    print(f"dropped {stats['dropped']} (seqs lost {stats['seq_lost']}), delayed >{args.late_ms:g} ms "
+          f"{stats['delayed']}, coalesced {stats['coalesced']}, garbage bytes {stats['bad_bytes']}")
+    if stats["delay_ms"] is not None:
+        p = stats["delay_ms"]
+        print(f"delivery delay p50 {p[0]:.2f} / p95 {p[1]:.2f} / p99 {p[2]:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
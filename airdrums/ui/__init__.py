@@ -0,0 +1,2 @@
+"""pygame front ends. Each module has a main(); the top-level laptop.py,
+laptop2.py and tester.py scripts just call it."""
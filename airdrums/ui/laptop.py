@@ -0,0 +1,308 @@
+"""Two-mode kit: stick mode 0 plays snare/kick, mode 1 closed/open hat."""
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+from ..engine.latency import LatencyTracer
+from ..engine.mix_engine import MixEngine, SoundDeviceSink, prepare
+from ..engine.polyphony import VoiceManager, live_sounds, make_sound
+from ..engine.profiling import SessionProfiler
+from ..engine.velocity import make_bank
+from ..synth import SAMPLE_RATE
+from ..synth.kit import Kit
+from ..synth.live import LiveSynth
+from ..transport.debounce import HitFilter
+from ..transport.reader import MultiReader
+from .waveform import WaveformView, TextSlot
+
+# --- CONFIGURATION ---
+WIDTH, HEIGHT = 800, 400
+KIT = os.environ.get('AIRDRUMS_KIT', 'laptop') # kits/<name>.json: pads per mode, colours, chokes, channels
+# Serial device, or replay:<file>[@speed] / synthetic:<hits per s> to run without the receiver.
+# Several receivers: comma separated, their hits are merged in time order
+SERIAL_PORT = os.environ.get('AIRDRUMS_PORT', '/dev/ttyUSB0') # CHECK THIS!
+RECORD_PATH = os.environ.get('AIRDRUMS_RECORD') # Record the raw stream here for replay later
+PROFILE_PATH = os.environ.get('AIRDRUMS_PROFILE') # Append allocation/GC/frame-time summaries here
+PROFILE_INTERVAL = float(os.environ.get("AIRDRUMS_PROFILE_INTERVAL", 60)) # Seconds between summaries
+BAUD_RATE = 115200
+VELOCITY_LAYERS = 16 # Pre-rendered loudness steps per instrument
+ROUND_ROBIN = 1      # Alternate takes per layer (more = less machine-gun, slower first start)
+AUDIO_BACKEND = "pygame" # "engine" = own mixer with small blocks (needs the sounddevice package)
+ENGINE_BLOCK = 128   # Frames per block for the "engine" backend (~3 ms)
+MIXER_BUFFER = 2048  # pygame mixer buffer in frames
+LATENCY_CSV = os.environ.get("AIRDRUMS_LATENCY_CSV") # Per-hit stage timings, written here on exit
+REORDER_MS = 4.0     # How long a hit waits for an earlier one from another receiver (several ports only)
+GESTURES = False     # Detect hits in raw IMU streams (stick_2.ino STREAM_IMU), stick angle picks the mode
+DISPATCH = "thread"  # "thread" = play straight from the serial reader, "frame" = old once-per-frame queue
+MIXER_CHANNELS = 32  # Voices pygame may mix at once (its default is 8)
+STEAL_POLICY = "oldest" # Voice to cut when an instrument runs out: "oldest" or "quietest"
+DEBOUNCE = True      # Drop echoes and retransmitted duplicates per stick (transport/debounce.py)
+TWEAKS = True        # Arrow keys re-synthesize pads live (synth/live.py)
+TWEAK_MEMO = 16      # Recent parameter sets kept ready to swap back in
+
+
+class Drums:
+    """Everything between the serial port and the speakers, without the window.
+
+    Build it with load(), then start() the reader; the render loop drains
+    display_queue (and sound_queue with DISPATCH == "frame").
+    """
+
+    def __init__(self, kit_name=KIT):
+        self.sound_queue = queue.Queue()   # DISPATCH == "frame": hits waiting for the main thread
+        self.display_queue = queue.Queue() # Played hits for the render loop: (mode, slot, event)
+        self.tracer = LatencyTracer()
+        self.profiler = SessionProfiler(PROFILE_PATH, PROFILE_INTERVAL) if PROFILE_PATH else None
+        self.hit_filter = HitFilter() if DEBOUNCE else None
+        # Kit Mapping (kits/laptop.json)
+        # Mode 0: Snare (ID 2) & Kick (ID 1)
+        # Mode 1: Closed Hat (ID 2) & Open Hat (ID 1)
+        self.kit = Kit(kit_name, ROUND_ROBIN, prepare=self.prepare_pad)
+        self.engine = None
+        self.voices = None
+        self.reader = None
+        self.live = None
+        self.thread = None
+        self.stopping = threading.Event() # Set on quit: the reader stops playing before pygame goes away
+
+    def prepare_pad(self, takes):
+        # Volume Logic: the kit's velocity curve, baked into the layers (channel volume for recorded pads)
+        bank = make_bank(takes, gain=self.kit.gain, layers=VELOCITY_LAYERS)
+        return bank, (prepare(takes[0]) if AUDIO_BACKEND == "engine" else None)
+
+    def synthesize(self):
+        """Only the starting mode, and before pygame starts its audio thread (the pool forks)."""
+        print("Loading PRO Sounds (synthesizing any that are not cached)...")
+        self.kit.synthesize(self.kit.modes[0], workers=None, report=print)
+
+    def load(self):
+        """Needs the mixer: builds the starting mode's sounds and the voice manager."""
+        self.kit.load(self.kit.modes[0])
+        self.kit.prefetch(self.kit.modes[1:]) # The other modes are ready before anyone toggles to them
+        if AUDIO_BACKEND == "engine":
+            self.engine = MixEngine(SoundDeviceSink(), block_size=ENGINE_BLOCK)
+            self.engine.start()
+        self.voices = VoiceManager(MIXER_CHANNELS, self.kit.reserved, self.kit.chokes, STEAL_POLICY)
+        if TWEAKS:
+            self.live = LiveSynth(self.kit, TWEAK_MEMO).start()
+        if self.profiler:
+            self.profiler.gauge("sounds", live_sounds)
+            self.profiler.gauge("busy channels", self.voices.busy)
+            self.profiler.start()
+        print("Sounds ready!")
+
+    def play_hit(self, sid, intensity, mode, slot):
+        """Starts the sound for one hit and returns what the screen should show (or None)."""
+        # First hit in a mode loads it here if the prefetch hasn't yet
+        voice = self.kit.voice(mode, sid)
+        if voice is None:
+            return None
+        pad, (bank, engine_data) = voice
+
+        snd, preview = bank.get(intensity)
+        self.tracer.mark(slot, "lookup", time.perf_counter())
+
+        if self.engine:
+            # Software mixer: gain per voice, same choke groups
+            self.engine.trigger(engine_data, gain=bank.gain(intensity),
+                                group=pad.group, chokes=self.kit.chokes.get(pad.group, ()))
+        else:
+            # Channel pool, voice stealing and chokes (e.g. CH cuts OH) live in the manager
+            self.voices.play(pad.group, snd, bank.gain(intensity), bank.volume(intensity))
+        self.tracer.mark(slot, "played", time.perf_counter())
+        return preview, pad.color, pad.label, bank.layer_for(intensity)
+
+    def serial_worker(self, port=SERIAL_PORT):
+        tracer, hit_filter, profiler = self.tracer, self.hit_filter, self.profiler
+        try:
+            print(f"Opening {port}...")
+            self.reader = reader = MultiReader(port.split(","), BAUD_RATE, REORDER_MS, record=RECORD_PATH,
+                                               gestures=GESTURES)
+            print("Serial Port Open! Waiting for data...")
+
+            # Binary frames or ID:INTENSITY:MODE text per port, auto-detected; one select for all ports
+            while not self.stopping.is_set():
+                try:
+                    events = reader.poll()
+                    parsed = time.perf_counter()
+                    for merged in events:
+                        hit = merged.hit
+                        if hit_filter and not hit_filter.accept(hit, merged.time):
+                            continue
+                        allocated = profiler.hit_begin() if profiler else None
+                        slot = tracer.new_hit(hit.sid, hit.intensity, merged.arrived)
+                        tracer.mark(slot, "parsed", parsed) # Includes the reorder wait
+                        if DISPATCH == "thread":
+                            # Play right here, only the visuals wait for the next frame
+                            event = self.play_hit(hit.sid, hit.intensity, hit.mode, slot)
+                            tracer.mark(slot, "enqueued", time.perf_counter())
+                            self.display_queue.put((hit.mode, slot, event))
+                        else:
+                            # Send valid data to the main thread via queue
+                            tracer.mark(slot, "enqueued", time.perf_counter())
+                            self.sound_queue.put((hit.sid, hit.intensity, hit.mode, slot))
+                        if profiler:
+                            profiler.hit_end(allocated)
+
+                except Exception as e:
+                    print(f"Read Error: {e}")
+
+        except Exception as e:
+            print(f"CRITICAL SERIAL ERROR: {e}")
+            print("Did you forget to close the Arduino Serial Monitor?")
+
+    def start(self, port=SERIAL_PORT):
+        self.thread = threading.Thread(target=self.serial_worker, args=(port,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Ends the reader thread and closes the ports. Call before pygame.quit(): a
+        Channel.play() from the reader while the mixer shuts down crashes the process."""
+        self.stopping.set()
+        if self.thread:
+            self.thread.join(2.0)
+        if self.reader:
+            self.reader.close()
+        if self.live:
+            self.live.stop()
+
+    def report(self, buffer_ms):
+        print(f"Latency: {self.tracer.summary()} (+{buffer_ms:.0f} ms mixer buffer)")
+        if LATENCY_CSV:
+            print(f"Wrote {self.tracer.dump_csv(LATENCY_CSV)} hits to {LATENCY_CSV}")
+        voices = self.voices
+        print(f"Voices played {dict(voices.played)}, stolen {dict(voices.stolen)}, choked {dict(voices.choked)}")
+        if self.hit_filter:
+            print(f"Filter: {self.hit_filter.summary()}")
+        if self.live:
+            print(f"Tweaks: {self.live.summary()}")
+        if self.profiler:
+            self.profiler.stop()
+            print(f"Profile summaries in {PROFILE_PATH}")
+        if self.reader:
+            print(f"Ports: {self.reader.summary()}")
+            for p in self.reader.ports:
+                for line in p.link.report():
+                    print(f"{p.name} {line}")
+                if p.gestures:
+                    print(f"{p.name}: {p.gestures.summary()}")
+
+
+def main():
+    drums = Drums()
+    drums.synthesize()
+
+    # --- INIT ---
+    # Increased buffer to 2048 to prevent Linux audio silence/glitches
+    pygame.mixer.pre_init(SAMPLE_RATE, -16, 1, MIXER_BUFFER)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(drums.kit.title)
+    font = pygame.font.SysFont('Arial', 24)
+    drums.load()
+
+    # Play startup sound (the kick)
+    kit = drums.kit
+    startup_pad = kit.pad(kit.modes[0], 1)
+    startup_snd = make_sound(kit.synthesize(kit.modes[0])[startup_pad][0])
+    startup_snd.set_volume(0.5)
+    startup_snd.play()
+
+    drums.start()
+    tracer = drums.tracer
+
+    # --- MAIN LOOP ---
+    clock = pygame.time.Clock()
+    small_font = pygame.font.SysFont('Arial', 14)
+    buffer_ms = MIXER_BUFFER / SAMPLE_RATE * 1000
+    frame_count = 0
+    active_mode = 0
+
+    # Display widgets: each repaints only its own area, and only when it changed
+    BG = (10,10,15)
+    wave = WaveformView(WIDTH, HEIGHT, y_scale=150, line_width=2, bg=BG)
+    label_slot = TextSlot(font, (20,20), BG)
+    label_slot.set("Ready", (100,100,100))
+    hud_slots = [TextSlot(small_font, (20, HEIGHT - 78 + i * 18), BG) for i in range(4)]
+    tweak_slot = TextSlot(small_font, (20, 52), BG)
+    mode_rect = pygame.Rect(WIDTH-40, 20, 21, 21)
+    shown_mode = None
+    screen.fill(BG)
+    pygame.display.flip()
+
+    while True:
+        frame_start = time.perf_counter()
+        # 1. PROCESS SERIAL EVENTS
+        # DISPATCH == "frame": hits wait here for the frame to come around
+        while not drums.sound_queue.empty():
+            sid, intensity, mode, slot = drums.sound_queue.get()
+            tracer.mark(slot, "dequeued", time.perf_counter())
+            drums.display_queue.put((mode, slot, drums.play_hit(sid, intensity, mode, slot)))
+
+        # Played hits (from either path) only update the visuals
+        frame_slots = []
+        while not drums.display_queue.empty():
+            mode, slot, event = drums.display_queue.get()
+            if DISPATCH == "thread":
+                tracer.mark(slot, "dequeued", time.perf_counter())
+            active_mode = mode
+            if event:
+                preview, col, name, layer = event
+                wave.set(preview, col)
+                label_slot.set(f"KIT {mode}: {name}", col)
+                frame_slots.append(slot)
+                print(f"Playing: {name} (Layer: {layer})") # After play(), off the hot path
+
+        # 2. DRAWING
+        full_redraw = False
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                drums.stop()
+                drums.report(buffer_ms)
+                pygame.quit()
+                return
+            if e.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED): full_redraw = True
+            if e.type == pygame.KEYDOWN and drums.live:
+                drums.live.key(pygame.key.name(e.key)) # Arrows: pick and nudge a synth parameter
+
+        if full_redraw:
+            screen.fill(BG)
+            wave.dirty, shown_mode = True, None
+        dirty = [wave.draw(screen)]
+        # The waveform band overlaps the text, so text goes back on top after a repaint
+        force = dirty[0] is not None
+        dirty.append(label_slot.draw(screen, force))
+        if drums.live:
+            tweak_slot.set(drums.live.status(), (150,150,160))
+            dirty.append(tweak_slot.draw(screen, force))
+
+        # Mode Indicator
+        if active_mode != shown_mode or force:
+            shown_mode = active_mode
+            screen.fill(BG, mode_rect)
+            dirty.append(pygame.draw.circle(screen, (0,255,0) if active_mode==1 else (255,255,255), (WIDTH-30, 30), 10))
+
+        # Latency HUD, percentiles refreshed twice a second
+        if frame_count % 30 == 0:
+            hud_lines = [tracer.summary("played"), tracer.summary("rendered"),
+                         f"+ mixer buffer {buffer_ms:.0f} ms | {drums.voices.summary()}",
+                         drums.reader.link_summary() if drums.reader else ""]
+            for hud, line in zip(hud_slots, hud_lines):
+                hud.set(line, (150,150,160))
+        dirty += [s.draw(screen, force) for s in hud_slots]
+        frame_count += 1
+
+        dirty = [r for r in dirty if r]
+        if full_redraw:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+        rendered = time.perf_counter()
+        for slot in frame_slots:
+            tracer.mark(slot, "rendered", rendered)
+        if drums.profiler:
+            drums.profiler.frame(rendered - frame_start)
+        clock.tick(60)
@@ -0,0 +1,251 @@
+"""Four-stick kit: every stick id has its own instrument, whatever the mode."""
+import os
+import threading
+import time
+
+import numpy as np
+import pygame
+
+from ..engine.latency import LatencyTracer
+from ..engine.polyphony import VoiceManager, live_sounds
+from ..engine.profiling import SessionProfiler
+from ..engine.velocity import make_bank
+from ..synth import SAMPLE_RATE
+from ..synth.kit import Kit
+from ..synth.live import LiveSynth
+from ..transport.debounce import HitFilter
+from ..transport.reader import MultiReader
+from .waveform import WaveformView, TextSlot
+
+# --- CONFIGURATION ---
+WIDTH, HEIGHT = 800, 400
+KIT = os.environ.get('AIRDRUMS_KIT', 'laptop2') # kits/<name>.json: pads, colours, chokes, test keys
+# Serial device, or replay:<file>[@speed] / synthetic:<hits per s> to run without the receiver.
+# Several receivers (e.g. one per pair of sticks): comma separated, merged in time order
+SERIAL_PORT = os.environ.get('AIRDRUMS_PORT', '/dev/ttyUSB0') # Ensure this matches your port
+RECORD_PATH = os.environ.get('AIRDRUMS_RECORD') # Record the raw stream here for replay later
+PROFILE_PATH = os.environ.get('AIRDRUMS_PROFILE') # Append allocation/GC/frame-time summaries here
+PROFILE_INTERVAL = float(os.environ.get("AIRDRUMS_PROFILE_INTERVAL", 60)) # Seconds between summaries
+BAUD_RATE = 115200
+VELOCITY_LAYERS = 16 # Pre-rendered loudness steps per instrument
+ROUND_ROBIN = 1      # Alternate takes per layer
+MIXER_BUFFER = 1024  # pygame mixer buffer in frames
+LATENCY_CSV = os.environ.get("AIRDRUMS_LATENCY_CSV") # Per-hit stage timings, written here on exit
+REORDER_MS = 4.0     # How long a hit waits for an earlier one from another receiver (several ports only)
+MIXER_CHANNELS = 32  # Voices pygame may mix at once (its default is 8)
+STEAL_POLICY = "oldest" # Voice to cut when an instrument runs out: "oldest" or "quietest"
+TWEAKS = True        # Arrow keys re-synthesize pads live (synth/live.py), test keys audition them
+TWEAK_MEMO = 16      # Recent parameter sets kept ready to swap back in
+
+
+class Drums:
+    """Kit, voices and the serial listener; the window only reads the display fields."""
+
+    def __init__(self, kit_name=KIT):
+        # MAPPING (kits/laptop2.json): stick ids 1-4, the same in every mode
+        # Volume Scaling (never quieter than 20%) is the kit's velocity curve, baked into the layers
+        self.kit = Kit(kit_name, ROUND_ROBIN,
+                       prepare=lambda takes: make_bank(takes, gain=self.kit.gain, layers=VELOCITY_LAYERS))
+        self.voices = None
+        self.tracer = LatencyTracer()
+        self.profiler = SessionProfiler(PROFILE_PATH, PROFILE_INTERVAL) if PROFILE_PATH else None
+        self.reader = None
+        self.live = None
+        self.thread = None
+        self.stopping = threading.Event() # Set on quit: the listener stops playing before pygame goes away
+        self.hit_filter = HitFilter() # Per-stick double-trigger suppression, replaces the fixed 80 ms cooldown
+        # Written by the serial thread; the loop notices a new current_wf by identity
+        self.current_wf = np.zeros(1000)
+        self.wf_color = (100, 100, 100)
+        self.label_text = "Waiting for Sticks..."
+
+    def synthesize(self):
+        # Synthesize before pygame starts its audio thread: the pool forks worker processes
+        print("Synthesizing New Snare & Cymbals...")
+        self.kit.synthesize(self.kit.modes[0], workers=None, report=print)
+
+    def load(self):
+        self.kit.load(self.kit.modes[0])
+        self.kit.prefetch(self.kit.modes[1:])
+        self.voices = VoiceManager(MIXER_CHANNELS, self.kit.reserved, self.kit.chokes, STEAL_POLICY)
+        if TWEAKS:
+            self.live = LiveSynth(self.kit, TWEAK_MEMO).start()
+        if self.profiler:
+            self.profiler.gauge("sounds", live_sounds)
+            self.profiler.gauge("busy channels", self.voices.busy)
+            self.profiler.start()
+
+    def test_hit(self, pad):
+        """Key test: plays a pad at full force."""
+        _, bank = self.kit.voice(pad.mode, pad.sid)
+        sound_obj, self.current_wf = bank.get(255)
+        self.voices.play(pad.group, sound_obj, volume=bank.volume(255))
+        self.wf_color = pad.color
+        self.label_text = f"{pad.label} (Key Test)"
+
+    # --- SERIAL LISTENER WITH SPAM FILTER ---
+    def serial_thread(self, port=SERIAL_PORT):
+        kit, voices, tracer, hit_filter, profiler = self.kit, self.voices, self.tracer, self.hit_filter, self.profiler
+        print(f"Opening {port}...")
+
+        try:
+            self.reader = reader = MultiReader(port.split(","), BAUD_RATE, REORDER_MS, record=RECORD_PATH)
+            print(f"SUCCESS: Connected to {port}")
+
+            # Binary frames or ID:INTENSITY[:MODE] text, whichever each receiver sends
+            while not self.stopping.is_set():
+                try:
+                    events = reader.poll(0.01)
+                    parsed = time.perf_counter()
+                    for event in events:
+                        hit = event.hit
+                        stick_id, intensity = hit.sid, hit.intensity
+
+                        # --- SPAM PROTECTION ---
+                        if not hit_filter.accept(hit, event.time):
+                            continue # Echo or duplicate of this stick's last hit
+                        allocated = profiler.hit_begin() if profiler else None
+
+                        slot = tracer.new_hit(stick_id, intensity, event.arrived)
+                        tracer.mark(slot, "parsed", parsed)
+
+                        voice = kit.voice(hit.mode, stick_id)
+                        if voice:
+                            pad, bank = voice
+                            sound_obj, scaled_sound = bank.get(intensity)
+                            tracer.mark(slot, "lookup", time.perf_counter())
+
+                            # Closed Hat choke and voice stealing are handled by the manager
+                            voices.play(pad.group, sound_obj, bank.gain(intensity), bank.volume(intensity))
+                            tracer.mark(slot, "played", time.perf_counter())
+
+                            self.current_wf = scaled_sound
+                            self.wf_color = pad.color
+                            self.label_text = f"{pad.label} (Vel: {intensity})"
+                        if profiler:
+                            profiler.hit_end(allocated)
+                        print(f"[HIT] ID: {stick_id}, Force: {intensity}") # After play(), off the hot path
+                except Exception as e:
+                    print(f"Serial Error: {e}")
+                    self.stopping.wait(1) # Wait before retrying
+
+        except Exception as e:
+            print(f"[FATAL] Could not open port: {e}")
+
+    def start(self, port=SERIAL_PORT):
+        self.thread = threading.Thread(target=self.serial_thread, args=(port,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Ends the listener and closes the ports; pygame.quit() under a playing thread crashes."""
+        self.stopping.set()
+        if self.thread:
+            self.thread.join(2.0)
+        if self.reader:
+            self.reader.close()
+        if self.live:
+            self.live.stop()
+
+    def report(self, buffer_ms):
+        voices = self.voices
+        print(f"Latency: {self.tracer.summary()} (+{buffer_ms:.0f} ms mixer buffer)")
+        if LATENCY_CSV:
+            print(f"Wrote {self.tracer.dump_csv(LATENCY_CSV)} hits to {LATENCY_CSV}")
+        print(f"Voices played {dict(voices.played)}, stolen {dict(voices.stolen)}, choked {dict(voices.choked)}")
+        print(f"Filter: {self.hit_filter.summary()}")
+        if self.live:
+            print(f"Tweaks: {self.live.summary()}")
+        if self.profiler:
+            self.profiler.stop()
+            print(f"Profile summaries in {PROFILE_PATH}")
+        if self.reader:
+            print(f"Ports: {self.reader.summary()}")
+            for p in self.reader.ports:
+                for line in p.link.report():
+                    print(f"{p.name} {line}")
+
+
+def main():
+    drums = Drums()
+    drums.synthesize()
+
+    # --- INITIALIZATION ---
+    pygame.mixer.pre_init(SAMPLE_RATE, -16, 1, MIXER_BUFFER)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(drums.kit.title)
+    drums.load()
+    test_keys = {pygame.key.key_code(name): pad for name, pad in drums.kit.keys().items()}
+    drums.start()
+
+    # --- MAIN LOOP ---
+    running = True
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont('Arial', 24)
+    small_font = pygame.font.SysFont('Arial', 14)
+    buffer_ms = MIXER_BUFFER / SAMPLE_RATE * 1000
+    frame_count = 0
+
+    # Display widgets: each repaints only its own area, and only when it changed
+    BG = (20, 20, 25)
+    wave = WaveformView(WIDTH, HEIGHT, y_scale=200, line_width=3, bg=BG)
+    label_slot = TextSlot(font, (20, 20), BG)
+    hud_slot = TextSlot(small_font, (20, HEIGHT - 48), BG)
+    link_slot = TextSlot(small_font, (20, HEIGHT - 30), BG)
+    tweak_slot = TextSlot(small_font, (20, 52), BG)
+    shown_wf = None # The serial thread swaps current_wf, the loop notices by identity
+    screen.fill(BG)
+    pygame.display.flip()
+
+    while running:
+        frame_start = time.perf_counter()
+        full_redraw = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED): full_redraw = True
+
+            if event.type == pygame.KEYDOWN:
+                # Test keys (S = New Snare, A = Kick, F = Closed Hat by default)
+                pad = test_keys.get(event.key)
+                if pad:
+                    drums.test_hit(pad)
+                elif drums.live:
+                    drums.live.key(pygame.key.name(event.key)) # Arrows: pick and nudge a synth parameter
+
+        if full_redraw:
+            screen.fill(BG)
+            wave.dirty = True
+        current_wf, wf_color = drums.current_wf, drums.wf_color
+        if current_wf is not shown_wf:
+            shown_wf = current_wf
+            wave.set(current_wf, wf_color)
+        label_slot.set(drums.label_text, wf_color)
+
+        dirty = [wave.draw(screen)]
+        # The waveform band covers the text, so text goes back on top after a repaint
+        force = dirty[0] is not None
+        dirty.append(label_slot.draw(screen, force))
+        if drums.live:
+            tweak_slot.set(drums.live.status(), (150, 150, 160))
+            dirty.append(tweak_slot.draw(screen, force))
+
+        # Latency HUD, percentiles refreshed twice a second
+        if frame_count % 30 == 0:
+            hud_slot.set(f"{drums.tracer.summary()}  + mixer buffer {buffer_ms:.0f} ms  {drums.voices.summary()}",
+                         (150, 150, 160))
+            link_slot.set(drums.reader.link_summary() if drums.reader else "", (150, 150, 160))
+        dirty += [hud_slot.draw(screen, force), link_slot.draw(screen, force)]
+        frame_count += 1
+
+        dirty = [r for r in dirty if r]
+        if full_redraw:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+        if drums.profiler:
+            drums.profiler.frame(time.perf_counter() - frame_start)
+        clock.tick(60)
+
+    drums.stop()
+    drums.report(buffer_ms)
+    pygame.quit()
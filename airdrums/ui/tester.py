@@ -0,0 +1,69 @@
+"""Keyboard-only sound check: one key per pad, no sticks or serial port needed."""
+import os
+
+import pygame
+
+from ..engine.polyphony import VoiceManager, make_sound
+from ..synth import SAMPLE_RATE
+from ..synth.kit import Kit
+from .waveform import WaveformView, TextSlot
+
+# --- CONFIGURATION ---
+WIDTH, HEIGHT = 800, 400
+KIT = os.environ.get('AIRDRUMS_KIT', 'tester') # kits/<name>.json: pads with their test keys
+
+
+def main():
+    # --- INITIALIZATION ---
+    pygame.mixer.pre_init(SAMPLE_RATE, -16, 1, 1024)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    print("Synthesizing...")
+    # Each pad loads as (SoundArray, Sound); colour and label come from the pad
+    kit = Kit(KIT, prepare=lambda takes: (takes[0], make_sound(takes[0])))
+    pygame.display.set_caption(kit.title)
+    kit.prefetch() # Ready before the first key press, without holding up the window
+    pads = {pygame.key.key_code(name): pad for name, pad in kit.keys().items()}
+
+    voices = VoiceManager(channels=16, reserved=kit.reserved, chokes=kit.chokes)
+
+    print("Ready! " + ", ".join(f"{name.upper()}={pad.label}" for name, pad in kit.keys().items()))
+
+    # --- MAIN LOOP ---
+    running = True
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont('Arial', 24)
+
+    # Graph widgets: only repainted when a key changes them
+    BG = (20, 20, 25)
+    wave = WaveformView(WIDTH, HEIGHT, y_scale=200, line_width=3, bg=BG)
+    label_slot = TextSlot(font, (20, 20), BG)
+    label_slot.set("Ready", (100, 100, 100))
+    screen.fill(BG)
+    pygame.display.flip()
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            if event.type == pygame.KEYDOWN and event.key in pads:
+                pad, (data, sound) = kit.voice(pads[event.key].mode, pads[event.key].sid)
+                voices.play(pad.group, sound) # Closed hat chokes the open hat
+
+                # --- UPDATE GRAPH DATA ---
+                # The first 1000 samples go to the visualizer
+                wave.set(data, pad.color)
+                label_slot.set(pad.label, pad.color)
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                screen.fill(BG)
+                wave.dirty = True
+
+        # Draw Waveform, then the label back on top of it
+        wave_rect = wave.draw(screen)
+        label_rect = label_slot.draw(screen, force=wave_rect is not None)
+        dirty = [r for r in (wave_rect, label_rect) if r]
+        if dirty:
+            pygame.display.update(dirty)
+        clock.tick(60)
+
+    pygame.quit()
@@ -0,0 +1,93 @@
+import numpy as np
+import pygame
+
+# --- WAVEFORM DISPLAY ---
+# The scripts used to rebuild 1000 points in Python and repaint the whole
+# window every frame. These widgets compute coordinates with NumPy into
+# preallocated buffers, only repaint when something changed, and return the
+# dirty rectangles for pygame.display.update().
+
+
+class WaveformView:
+    """Oscilloscope-style view of the last hit.
+
+    decay: optional per-frame amplitude factor (e.g. 0.9) to let the trace
+    fade out; while fading it keeps redrawing, otherwise only on set().
+    """
+
+    def __init__(self, width, height, y_scale, line_width=2, n_points=1000, bg=(10, 10, 15), decay=None):
+        self.y_scale = y_scale
+        self.line_width = line_width
+        self.bg = bg
+        self.decay = decay
+        self.centre = height / 2
+        top = max(0, int(self.centre - y_scale - line_width))
+        bottom = min(height, int(self.centre + y_scale + line_width) + 1)
+        self.rect = pygame.Rect(0, top, width, bottom - top)
+
+        self.wf = np.zeros(n_points, dtype=np.float32)
+        self._y = np.empty(n_points, dtype=np.float32)
+        self._points = np.empty((n_points, 2), dtype=np.int32)
+        self._points[:, 0] = np.arange(n_points) * (width / n_points)
+        self.color = (100, 100, 100)
+        self.amp = 1.0
+        self.dirty = True
+
+    def set(self, wf, color):
+        n = min(len(wf), len(self.wf))
+        self.wf[:n] = wf[:n]
+        self.wf[n:] = 0.0
+        self.color = color
+        self.amp = 1.0
+        self.dirty = True
+
+    @property
+    def animating(self):
+        return self.decay is not None and self.amp > 0.01 and self.wf.any()
+
+    def draw(self, screen):
+        """Repaints the band if needed; returns the rect to update or None."""
+        if not (self.dirty or self.animating):
+            return None
+        if not self.dirty:
+            self.amp *= self.decay
+        self.dirty = False
+
+        screen.fill(self.bg, self.rect)
+        if self.amp > 0.01 and self.wf.any():
+            np.multiply(self.wf, self.amp * self.y_scale / 32767, out=self._y)
+            self._y += self.centre
+            self._points[:, 1] = self._y # Truncates like int() did
+            # A list of plain ints is much faster for pygame to walk than an ndarray
+            pygame.draw.lines(screen, self.color, False, self._points.tolist(), self.line_width)
+        return self.rect
+
+
+class TextSlot:
+    """A line of text that is only re-rendered and repainted when it changes."""
+
+    def __init__(self, font, pos, bg=(10, 10, 15)):
+        self.font = font
+        self.pos = pos
+        self.bg = bg
+        self.value = None
+        self.rect = pygame.Rect(pos, (0, 0))
+        self._surface = None
+        self.dirty = False
+
+    def set(self, text, color):
+        if (text, color) != self.value:
+            self.value = (text, color)
+            self._surface = self.font.render(text, True, color, self.bg) # Opaque, so re-blitting is idempotent
+            self.dirty = True
+
+    def draw(self, screen, force=False):
+        """Repaints if changed (or forced, e.g. after the waveform painted over it)."""
+        if not (self.dirty or force) or self._surface is None:
+            return None
+        old = self.rect
+        if self.dirty:
+            screen.fill(self.bg, old) # The previous text may have been longer
+            self.dirty = False
+        self.rect = screen.blit(self._surface, self.pos)
+        return self.rect.union(old)
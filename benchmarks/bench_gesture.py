@@ -0,0 +1,92 @@
+"""Accuracy and compute time of the IMU gesture detector on simulated sticks.
+
+Run from the repo root:
+    python benchmarks/bench_gesture.py                  # 4 sticks, 20 s of playing
+    python benchmarks/bench_gesture.py --sticks 16      # how the batch cost scales
+
+Each stick streams 100 Hz IMU frames. Now and then it swings (gyro up, a
+slow accel ramp) and hits (a one-sample accel spike), held either level
+(snare, mode 0) or raised 40 degrees (hats, mode 1). The frames go through
+HitDecoder and GestureDetector in 10 ms reads, like the reader thread; the
+detected hits are matched against the simulated ones by stick and time.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from airdrums.transport.gesture import GestureDetector  # noqa: E402
+from airdrums.transport.protocol import HitDecoder, encode_imu_frame  # noqa: E402
+
+RATE = 100      # IMU samples per second per stick
+G = 9.81
+PITCHES = {0: 0.0, 1: 40.0} # mode -> stick angle in degrees
+
+
+def simulate(sticks, seconds, hits_per_s, seed=0):
+    """([(millis, frame bytes)], [(sid, impact millis, mode, strength)]) for all sticks."""
+    rng = np.random.RandomState(seed)
+    frames, truth = [], []
+    for sid in range(1, sticks + 1):
+        n = seconds * RATE
+        accel = np.zeros((n, 3))
+        gyro = np.zeros((n, 3))
+        pitch = np.zeros(n)
+        t = int(rng.randint(20, 60))
+        while t < n - 20:
+            mode = int(rng.randint(0, 2))
+            strength = rng.uniform(35, 110) # Jerk at impact, m/s^2
+            pitch[t - 12:] = PITCHES[mode]
+            accel[t - 6:t, 2] += np.linspace(2, 12, 6)      # Swing down
+            gyro[t - 6:t, 1] = np.linspace(1, 6, 6)
+            accel[t, 2] -= strength                        # Impact
+            accel[t + 1:t + 4, 2] -= strength * np.array([0.3, 0.1, 0.03])
+            truth.append((sid, t * 10, mode, strength))
+            t += int(rng.exponential(RATE / hits_per_s)) + 15
+        rad = np.radians(pitch)
+        accel[:, 0] += -G * np.sin(rad)
+        accel[:, 2] += G * np.cos(rad)
+        accel += rng.normal(0, 0.3, accel.shape)
+        for k in range(n):
+            frames.append((k * 10, encode_imu_frame(sid, 0, k, k * 10, accel[k], gyro[k])))
+    frames.sort(key=lambda f: f[0])
+    return frames, truth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the IMU gesture detector.")
+    parser.add_argument("--sticks", type=int, default=4)
+    parser.add_argument("--seconds", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=3.0, help="hits per second per stick")
+    args = parser.parse_args(argv)
+
+    frames, truth = simulate(args.sticks, args.seconds, args.rate)
+    decoder, detector = HitDecoder(), GestureDetector()
+    hits = []
+    for tick in range(0, args.seconds * 1000, 10):
+        data = b"".join(f for millis, f in frames[tick // 10 * args.sticks:(tick // 10 + 1) * args.sticks])
+        decoder.feed(data)
+        hits += detector.feed(decoder.take_imu(), now=tick / 1000)
+
+    found = {(h.sid, h.millis): h for h in hits}
+    detected = [found.get((sid, millis)) for sid, millis, _, _ in truth]
+    hit_count = sum(h is not None for h in detected)
+    zones_ok = sum(h is not None and h.mode == mode for h, (_, _, mode, _) in zip(detected, truth))
+    extra = len(hits) - hit_count
+
+    us = np.array(detector.compute_s) * 1e6
+    print(f"{args.sticks} sticks, {len(frames)} IMU frames, {len(truth)} simulated hits")
+    print(f"detected {hit_count}/{len(truth)}, zone right {zones_ok}/{hit_count}, false hits {extra}")
+    print(f"per 10 ms batch: p50 {np.percentile(us, 50):.0f} us, p99 {np.percentile(us, 99):.0f} us, "
+          f"max {us.max():.0f} us; {us.sum() / detector.windows:.1f} us per stick window")
+    start = time.perf_counter()
+    HitDecoder().feed(b"".join(f for _, f in frames))
+    print(f"decode: {(time.perf_counter() - start) / len(frames) * 1e6:.2f} us per frame in one batch")
+    return 0 if hit_count == len(truth) and zones_ok == hit_count and extra == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Block render time of mix_engine.MixEngine at several block sizes.
+
+Run from the repo root:  python benchmarks/bench_mix_engine.py [out.wav]
+With a path, the 64-frame run is also written to a WAV file for listening.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from airdrums.engine.mix_engine import MixEngine, NullSink, WavSink, prepare  # noqa: E402
+from airdrums.synth.sample_cache import load_voice  # noqa: E402
+from airdrums.synth import SAMPLE_RATE  # noqa: E402
+
+SECONDS = 10
+HITS_PER_SECOND = 40 # Fast roll across the kit
+
+
+def run(block_size, sink):
+    voices = [prepare(load_voice(n)) for n in ("punchy_snare", "pro_kick", "pro_closed_hat", "pro_open_hat")]
+    engine = MixEngine(sink, block_size=block_size)
+    rng = np.random.RandomState(0)
+    hit_every = SAMPLE_RATE // HITS_PER_SECOND
+    frame = 0
+    while frame < SECONDS * SAMPLE_RATE:
+        if frame % hit_every < block_size:
+            i = rng.randint(len(voices))
+            engine.trigger(voices[i], gain=rng.uniform(0.3, 1.0), group=i, chokes=(3,) if i == 2 else ())
+        engine.render(block_size)
+        frame += block_size
+    engine.close()
+    return engine.stats()
+
+
+def main():
+    wav_path = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"{'block':>6}{'block ms':>10}{'mean ms':>10}{'max ms':>10}{'load':>8}{'stolen':>8}")
+    for block_size in (64, 128, 256):
+        sink = WavSink(wav_path) if wav_path and block_size == 64 else NullSink()
+        s = run(block_size, sink)
+        print(f"{block_size:>6}{s['block_ms']:>10.2f}{s['mean_render_ms']:>10.3f}{s['max_render_ms']:>10.3f}"
+              f"{s['load']:>7.1%}{s['stolen']:>8}")
+
+
+if __name__ == "__main__":
+    main()
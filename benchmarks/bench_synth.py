@@ -0,0 +1,157 @@
+"""Speed, memory and sound regression check for every generator in synth.VOICES.
+
+Run from the repo root:
+    python benchmarks/bench_synth.py            # compare against the baseline, exit 1 on regressions
+    python benchmarks/bench_synth.py --save     # record a new baseline (after an intended change)
+    python benchmarks/bench_synth.py pro_kick   # only some voices
+
+Each voice is generated for several seeds. Timing runs are separate from the
+tracemalloc run, which slows allocation down. The sound is fingerprinted with
+statistics averaged over the seeds (RMS, peak, spectral centroid and the energy
+share of four bands), because an optimized generator may draw its random
+numbers in a different order and never match sample for sample.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from airdrums import synth  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "synth.json")
+SEEDS = range(5)
+REPEATS = 5 # Timed runs per seed; the fastest counts
+BANDS = (0, 200, 2000, 8000, synth.SAMPLE_RATE / 2) # Hz edges of the energy-share bands
+
+# Allowed change against the baseline
+TIME_TOLERANCE = 1.5    # x slower
+TIME_SLACK_MS = 0.5     # plus this much, sub-millisecond timings are noisy
+MEMORY_TOLERANCE = 1.25 # x more peak memory
+SOUND_TOLERANCE = 0.02  # relative change of a fingerprint value
+SHARE_TOLERANCE = 0.01  # absolute change of a band energy share
+
+
+def fingerprint(x):
+    x = np.asarray(x, dtype=np.float64) / 32767
+    spec = np.abs(np.fft.rfft(x)) ** 2
+    freqs = np.fft.rfftfreq(len(x), 1 / synth.SAMPLE_RATE)
+    total = spec.sum() + 1e-12
+    shares = [spec[(freqs >= lo) & (freqs < hi)].sum() / total for lo, hi in zip(BANDS, BANDS[1:])]
+    return {
+        "length": len(x),
+        "rms": float(np.sqrt(np.mean(x ** 2))),
+        "peak": float(np.abs(x).max()),
+        "centroid_hz": float(np.sum(freqs * spec) / total),
+        "band_shares": [float(s) for s in shares],
+    }
+
+
+def generate(fn, params, seed):
+    np.random.seed(seed)
+    return fn(**params)
+
+
+def measure(name):
+    fn, params = synth.VOICES[name]
+    generate(fn, params, 0) # Warm-up: lazy imports, first-call allocations
+
+    best = []
+    prints = []
+    for seed in SEEDS:
+        times = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            out = generate(fn, params, seed)
+            times.append(time.perf_counter() - start)
+        best.append(min(times))
+        prints.append(fingerprint(out))
+
+    tracemalloc.start()
+    generate(fn, params, SEEDS[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = float(np.median(best))
+    return {
+        "ms": seconds * 1000,
+        "samples_per_s": prints[0]["length"] / seconds,
+        "peak_kb": peak / 1024,
+        "sound": {
+            "length": prints[0]["length"],
+            "rms": float(np.mean([p["rms"] for p in prints])),
+            "peak": float(np.mean([p["peak"] for p in prints])),
+            "centroid_hz": float(np.mean([p["centroid_hz"] for p in prints])),
+            "band_shares": np.mean([p["band_shares"] for p in prints], axis=0).tolist(),
+        },
+    }
+
+
+def compare(name, result, base):
+    """List of regression messages for one voice (empty = pass)."""
+    problems = []
+    if result["ms"] > base["ms"] * TIME_TOLERANCE + TIME_SLACK_MS:
+        problems.append(f"{name}: {result['ms']:.2f} ms, baseline {base['ms']:.2f} ms")
+    if result["peak_kb"] > base["peak_kb"] * MEMORY_TOLERANCE:
+        problems.append(f"{name}: peak {result['peak_kb']:.0f} KiB, baseline {base['peak_kb']:.0f} KiB")
+    new, old = result["sound"], base["sound"]
+    if new["length"] != old["length"]:
+        problems.append(f"{name}: length {new['length']}, baseline {old['length']}")
+    for key in ("rms", "peak", "centroid_hz"):
+        if abs(new[key] - old[key]) > SOUND_TOLERANCE * abs(old[key]):
+            problems.append(f"{name}: {key} {new[key]:.4g}, baseline {old[key]:.4g}")
+    for i, (a, b) in enumerate(zip(new["band_shares"], old["band_shares"])):
+        if abs(a - b) > SHARE_TOLERANCE:
+            problems.append(f"{name}: {BANDS[i]:.0f}-{BANDS[i + 1]:.0f} Hz share {a:.3f}, baseline {b:.3f}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark and fingerprint the drum generators.")
+    parser.add_argument("voices", nargs="*", help="synth.VOICES names (default: all)")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE)
+    args = parser.parse_args(argv)
+
+    assert "pygame" not in sys.modules, "synth must stay importable without pygame"
+    names = args.voices or list(synth.VOICES)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'voice':<16}{'ms':>9}{'Msamples/s':>12}{'peak KiB':>10}{'rms':>8}{'centroid':>10}  vs baseline")
+    results = {}
+    problems = []
+    for name in names:
+        r = results[name] = measure(name)
+        base = baseline.get(name)
+        found = compare(name, r, base) if base else []
+        problems += found
+        status = "new" if base is None else "REGRESSED" if found else f"{r['ms'] / base['ms']:.2f}x time"
+        print(f"{name:<16}{r['ms']:>9.2f}{r['samples_per_s'] / 1e6:>12.2f}{r['peak_kb']:>10.0f}"
+              f"{r['sound']['rms']:>8.4f}{r['sound']['centroid_hz']:>10.0f}  {status}")
+
+    if args.save:
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline for {len(results)} voices to {args.baseline}")
+        return 0
+
+    for p in problems:
+        print(f"  {p}")
+    if problems:
+        print(f"{len(problems)} regressions (re-run with --save if the change is intended)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Per-hit cost of the old scale + make_sound path against a VelocityBank lookup.
+
+Run from the repo root:  python benchmarks/bench_velocity.py
+(set SDL_AUDIODRIVER=dummy on machines without a sound card)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from airdrums.synth.sample_cache import load_variants  # noqa: E402
+from airdrums.synth import SAMPLE_RATE  # noqa: E402
+from airdrums.engine.velocity import VelocityBank  # noqa: E402
+
+HITS = 2000
+
+
+def old_hit(raw_data, intensity):
+    # laptop2.py serial_thread before the velocity layers
+    vol_factor = max(0.2, intensity / 255.0)
+    scaled_sound = (raw_data * vol_factor).astype(np.int16)
+    return pygame.sndarray.make_sound(scaled_sound)
+
+
+def main():
+    pygame.mixer.init(SAMPLE_RATE, -16, 1, 1024)
+    intensities = np.random.RandomState(0).randint(50, 256, HITS)
+    for name in ("deep_kick", "open_cymbal"):
+        takes = load_variants(name, 1)
+        start = time.perf_counter()
+        bank = VelocityBank(takes, gain=lambda i: max(0.2, i / 255.0))
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in intensities:
+            old_hit(takes[0], int(i))
+        t_old = (time.perf_counter() - start) / HITS
+
+        start = time.perf_counter()
+        for i in intensities:
+            bank.get(int(i))
+        t_new = (time.perf_counter() - start) / HITS
+        print(f"{name:<12} per hit: old {t_old * 1e6:8.1f} us  bank {t_new * 1e6:6.2f} us"
+              f"  (bank build {build * 1000:.1f} ms)")
+    pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,96 @@
 #include <espnow.h>
 
 // --- DATA STRUCTURE (Must Match Sender) ---
-typedef struct struct_message {
+// Sticks from before numbering send only the first 12 bytes (id, intensity, mode)
+typedef struct __attribute__((packed)) struct_message {
     int id;
     int intensity;
     int mode;
+    uint16_t seq;
+    uint32_t sent_us;
 } struct_message;
 
+const uint8_t UNNUMBERED_LEN = 12;
 struct_message myData;
 
+// Raw sample from a stick built with STREAM_IMU (14 bytes, struct_message is 18 or 12)
+typedef struct __attribute__((packed)) imu_message {
+    uint8_t id;
+    uint8_t mode;
+    int16_t accel[3];
+    int16_t gyro[3];
+} imu_message;
+
+imu_message imuData;
+
+// --- SERIAL FORMAT ---
+// 1 = compact 11 byte binary frame (see protocol.py), 0 = old ID:INTENSITY:MODE text
+#define BINARY_PROTOCOL 1
+const uint8_t FRAME_SYNC = 0xA5;
+const uint8_t STAMPED_SYNC = 0xA6;
+uint16_t frameSeq[256]; // Per stick, so the laptop can see dropped hits
+const uint8_t IMU_SYNC = 0xA7;
+uint16_t imuSeq[256];
+
+// FRAME: SYNC | ID | MODE | SEQ (u16 LE) | MILLIS (u32 LE) | AX AY AZ GX GY GZ (i16 LE) | XOR
+void sendImuFrame() {
+  uint8_t id = imuData.id;
+  uint16_t seq = imuSeq[id]++;
+  uint32_t now = millis();
+  uint8_t frame[22] = {
+    IMU_SYNC, id, imuData.mode, (uint8_t)(seq & 0xFF), (uint8_t)(seq >> 8),
+    (uint8_t)(now & 0xFF), (uint8_t)(now >> 8), (uint8_t)(now >> 16), (uint8_t)(now >> 24)
+  };
+  memcpy(frame + 9, imuData.accel, 6); // The ESP8266 is little endian too
+  memcpy(frame + 15, imuData.gyro, 6);
+  for (int i = 1; i < 21; i++) frame[21] ^= frame[i];
+  Serial.write(frame, sizeof(frame));
+}
+
 // --- CALLBACK ---
 void onDataRecv(uint8_t * mac, uint8_t *incomingData, uint8_t len) {
-  memcpy(&myData, incomingData, sizeof(myData));
-  
+  uint32_t recvUs = micros(); // First thing, so the radio delay doesn't include ours
+  if (len == sizeof(imuData)) {
+#if BINARY_PROTOCOL
+    memcpy(&imuData, incomingData, sizeof(imuData));
+    sendImuFrame();
+#endif
+    return; // The text protocol has no room for raw samples
+  }
+  if (len != sizeof(myData) && len != UNNUMBERED_LEN) return;
+  memcpy(&myData, incomingData, len);
+
+#if BINARY_PROTOCOL
+  if (len == sizeof(myData)) {
+    // FRAME: SYNC | ID | INTENSITY | MODE | STICK SEQ (u16 LE) | SENT US (u32 LE) | RECV US (u32 LE) | XOR
+    uint8_t frame[15] = {STAMPED_SYNC, (uint8_t)myData.id, (uint8_t)myData.intensity, (uint8_t)myData.mode};
+    memcpy(frame + 4, &myData.seq, 2);
+    memcpy(frame + 6, &myData.sent_us, 4);
+    memcpy(frame + 10, &recvUs, 4);
+    for (int i = 1; i < 14; i++) frame[14] ^= frame[i];
+    Serial.write(frame, sizeof(frame));
+    return;
+  }
+  // FRAME: SYNC | ID | INTENSITY | MODE | SEQ (u16 LE) | MILLIS (u32 LE) | XOR
+  uint8_t id = (uint8_t)myData.id;
+  uint16_t seq = frameSeq[id]++;
+  uint32_t now = millis();
+  uint8_t frame[11] = {
+    FRAME_SYNC, id, (uint8_t)myData.intensity, (uint8_t)myData.mode,
+    (uint8_t)(seq & 0xFF), (uint8_t)(seq >> 8),
+    (uint8_t)(now & 0xFF), (uint8_t)(now >> 8), (uint8_t)(now >> 16), (uint8_t)(now >> 24),
+    0
+  };
+  for (int i = 1; i < 10; i++) frame[10] ^= frame[i];
+  Serial.write(frame, sizeof(frame)); // One call, one burst on the wire
+#else
   // PRINT FORMAT:  ID:INTENSITY:MODE
   Serial.print(myData.id);
   Serial.print(":");
   Serial.print(myData.intensity);
   Serial.print(":");
   Serial.println(myData.mode);
+#endif
 }
 
 void setup() {
@@ -12,6 +12,11 @@ uint8_t receiverAddress[] = {0x48, 0x3F, 0xDA, 0x8B, 0x23, 0x0B};
 const int BUTTON_PIN = 13;
 const int GND_PIN = 12; // Software Ground
 int STICK_ID = 2;       // 1 = Right Hand
+const float JERK_THRESHOLD = 25.0;
+const unsigned long MIN_GAP_MS = 30; // Only a floor: the laptop's hit filter drops echoes
+// 1 = also send every raw sample (~100 Hz) so the laptop can classify hits by
+// stick angle (GESTURES in laptop.py); the trigger below still goes out as a fallback
+#define STREAM_IMU 0
 
 // --- VARIABLES ---
 Adafruit_MPU6050 mpu;
@@ -22,13 +27,26 @@ int currentMode = 0;
 bool lastButtonState = HIGH;
 
 // --- DATA STRUCTURE ---
-typedef struct struct_message {
+typedef struct __attribute__((packed)) struct_message {
   int id;
   int intensity; 
   int mode;
+  uint16_t seq;     // Counts every hit sent, so the laptop can spot lost/doubled ones
+  uint32_t sent_us; // micros() when the hit was detected, for the radio delay
 } struct_message;
 
 struct_message myData;
+uint16_t hitSeq = 0;
+
+// Raw sample, told apart from struct_message by its size on the receiver
+typedef struct __attribute__((packed)) imu_message {
+  uint8_t id;
+  uint8_t mode;
+  int16_t accel[3]; // m/s^2 x 100
+  int16_t gyro[3];  // rad/s x 1000
+} imu_message;
+
+imu_message imuData;
 
 void setup() {
   Serial.begin(115200);
@@ -49,6 +67,9 @@ void setup() {
     while (1) yield();
   }
   mpu.setAccelerometerRange(MPU6050_RANGE_16_G);
+#if STREAM_IMU
+  mpu.setGyroRange(MPU6050_RANGE_2000_DEG);
+#endif
 
   // 4. ESP-NOW SETUP
   if (esp_now_init() != ESP_OK) {
@@ -84,15 +105,29 @@ void loop() {
                     pow(a.acceleration.y - prev_ay, 2) + 
                     pow(a.acceleration.z - prev_az, 2));
 
-  if (jerk > 25.0 && (millis() - lastTrigger > 110)) {
+  if (jerk > JERK_THRESHOLD && (millis() - lastTrigger > MIN_GAP_MS)) {
+    myData.sent_us = micros();
+    myData.seq = hitSeq++;
     myData.id = STICK_ID;
-    myData.intensity = constrain(map((long)jerk, 25, 100, 50, 255), 50, 255);
+    myData.intensity = constrain(map((long)jerk, (long)JERK_THRESHOLD, 100, 50, 255), 50, 255);
     myData.mode = currentMode;
     
     esp_now_send(receiverAddress, (uint8_t *) &myData, sizeof(myData));
     lastTrigger = millis();
   }
 
+#if STREAM_IMU
+  imuData.id = STICK_ID;
+  imuData.mode = currentMode;
+  imuData.accel[0] = (int16_t)constrain(a.acceleration.x * 100, -32768, 32767);
+  imuData.accel[1] = (int16_t)constrain(a.acceleration.y * 100, -32768, 32767);
+  imuData.accel[2] = (int16_t)constrain(a.acceleration.z * 100, -32768, 32767);
+  imuData.gyro[0] = (int16_t)constrain(g.gyro.x * 1000, -32768, 32767);
+  imuData.gyro[1] = (int16_t)constrain(g.gyro.y * 1000, -32768, 32767);
+  imuData.gyro[2] = (int16_t)constrain(g.gyro.z * 1000, -32768, 32767);
+  esp_now_send(receiverAddress, (uint8_t *) &imuData, sizeof(imuData));
+#endif
+
   prev_ax = a.acceleration.x;
   prev_ay = a.acceleration.y;
   prev_az = a.acceleration.z;
@@ -0,0 +1,67 @@
+"""Sequence accounting: the decoder only decodes, link.LinkStats counts.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from airdrums.transport.link import LinkStats  # noqa: E402
+from airdrums.transport.protocol import HitDecoder, encode_frame, encode_stamped_frame  # noqa: E402
+
+
+def stamped(seqs, sid=1, t0=0):
+    """Frames sent 10 ms apart from stick time t0 (us), in the order given."""
+    return b"".join(encode_stamped_frame(sid, 100, 0, seq, t0 + i * 10000, t0 + i * 10000 + 3000)
+                    for i, seq in enumerate(seqs))
+
+
+def observe(seqs, data=None):
+    link = LinkStats()
+    statuses = [link.observe(hit) for hit in HitDecoder().feed(data or stamped(seqs))]
+    return link.totals(), statuses
+
+
+def test_decoder_keeps_arrival_order():
+    hits = HitDecoder().feed(stamped([0, 1, 3, 2, 4]))
+    assert [h.seq for h in hits] == [0, 1, 3, 2, 4]
+    assert not hasattr(HitDecoder(), "dropped") # One loss figure, from LinkStats
+
+
+def test_reordered_is_not_lost():
+    totals, statuses = observe([0, 1, 3, 2, 4])
+    assert totals["lost"] == 0 and totals["reordered"] == 1 and totals["received"] == 5
+    assert statuses == ["ok", "ok", "ok", "reordered", "ok"]
+
+
+def test_gap_is_lost():
+    totals, _ = observe([0, 1, 4, 5])
+    assert totals["lost"] == 2 and totals["received"] == 4
+
+
+def test_duplicate():
+    totals, statuses = observe([0, 1, 1, 2])
+    assert statuses[2] == "duplicate"
+    assert totals["duplicates"] == 1 and totals["received"] == 3 and totals["lost"] == 0
+
+
+def test_seq_wraps():
+    totals, _ = observe([65534, 65535, 0, 1])
+    assert totals["lost"] == 0 and totals["restarts"] == 0
+
+
+def test_stick_reboot():
+    # 500 hits, then the stick reboots: seq and its micros() both start over
+    totals, statuses = observe(None, stamped(range(500), t0=60_000_000) + stamped(range(20)))
+    assert statuses[500] == "restart" and statuses[501:] == ["ok"] * 19
+    assert totals["restarts"] == 1 and totals["received"] == 520 and totals["duplicates"] == 0
+
+
+def test_receiver_reboot():
+    # Receiver-numbered frames (no stick clock): seq 0 after 500 is a restart
+    data = b"".join(encode_frame(1, 100, 0, seq, seq * 10) for seq in list(range(500)) + list(range(20)))
+    totals, statuses = observe(None, data)
+    assert statuses[500] == "restart" and statuses[501:] == ["ok"] * 19
+    assert totals["restarts"] == 1 and totals["received"] == 520 and totals["duplicates"] == 0
+
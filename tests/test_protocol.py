@@ -0,0 +1,24 @@
+"""Protocol auto-detection between the text and binary receivers.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from airdrums.transport.protocol import HitDecoder, encode_frame  # noqa: E402
+
+
+def test_text_line_is_not_a_frame():
+    # 22 bytes starting with "Z" whose last one is the XOR of the 20 between: an IMU frame under 0x5A
+    data = b"ZMPU6050 ready, id=1al\n1:200:0\n2:180:1\n"
+    decoder = HitDecoder()
+    hits = decoder.feed(data)
+    assert decoder.mode == "ascii" and [(h.sid, h.intensity) for h in hits] == [(1, 200), (2, 180)]
+
+
+def test_binary_after_boot_text():
+    decoder = HitDecoder()
+    hits = decoder.feed(b"booting...\n" + encode_frame(1, 200, 0, 0, 10) + encode_frame(2, 180, 1, 0, 12))
+    assert decoder.mode == "binary" and [h.sid for h in hits] == [1, 2]
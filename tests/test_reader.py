@@ -0,0 +1,34 @@
+"""MultiReader end to end, fed from a replayed recording.
+
+Run from the repo root:
+    python -m pytest tests
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from airdrums.transport.protocol import encode_imu_frame, encode_stamped_frame  # noqa: E402
+from airdrums.transport.reader import MultiReader  # noqa: E402
+
+
+def test_triggers_dropped_for_gestures_are_still_counted(tmp_path):
+    # A stick streaming IMU data: its own triggers don't play, but their seqs must reach the link
+    path = tmp_path / "imu.rec"
+    with open(path, "w") as f:
+        for k in range(30):
+            imu = b"".join(encode_imu_frame(1, 0, k * 10 + j, k * 100 + j * 10, [0, 0, 9.81], [0, 0, 0])
+                           for j in range(10))
+            trigger = encode_stamped_frame(1, 100, 0, k, k * 10000, k * 10000 + 3000)
+            f.write(f"{k * 0.002:.6f} {(imu + trigger).hex()}\n")
+    reader = MultiReader([f"replay:{path}"], gestures=True)
+    try:
+        played = []
+        deadline = time.perf_counter() + 5
+        while reader.ports[0].link.totals()["received"] < 30 and time.perf_counter() < deadline:
+            played += reader.poll(0.05)
+        totals = reader.ports[0].link.totals()
+        assert totals["received"] == 30 and totals["lost"] == 0
+        assert len(played) == 1 # Only the first played, it came before any IMU sample
+    finally:
+        reader.close()